@@ -0,0 +1,267 @@
+"""Batch analysis of whole game collections with the copilot engine.
+
+    python analysis.py archive/ analysis.jsonl --workers 4 --depth 5
+    python analysis.py games.pgn analysis.jsonl --movetime 200
+
+The source is a game archive directory (see ``game_archive.py``) or a PGN file.
+Games are read lazily and their positions fanned out to a process pool, with
+at most ``--max-inflight`` searches queued at a time. Positions that have
+already been searched (transpositions, shared openings) are answered from a
+cache in the parent instead of being searched again.
+
+The cache has two parts. Results still needed by a game that has not been
+written yet are reference-counted and always kept. Once no open game needs a
+result it moves to a least-recently-used list of at most ``--cache-size``
+positions. A bigger list re-searches fewer shared openings across a large
+collection, at a few hundred bytes of parent memory per position; ``0`` keeps
+memory flat but searches every game's positions afresh.
+
+Output is JSON Lines, one line per game in input order, flushed as each game
+completes. Rerunning the same command skips games already in the output file,
+so an interrupted run picks up where it stopped.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from collections import Counter, OrderedDict, deque
+from typing import Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+import chess
+import chess.pgn
+import chess.polyglot
+
+from engine import load_config
+from engine.search import MATE_SCORE, SearchLimits, Searcher
+from engine.tt import TranspositionTable
+from game_archive import GameArchive, read_pgn_games
+
+
+# A move losing this much (centipawns, for the side that played it) is a blunder.
+BLUNDER_CP = 200
+# Scores are clamped here before computing losses so mates compare sanely.
+EVAL_CLAMP = 1_000
+# Results no open game needs that are kept for later transpositions.
+CACHE_POSITIONS = 100_000
+
+
+# -----------------------------------------------------------------------------
+# Worker process side
+# -----------------------------------------------------------------------------
+
+_worker_searcher: Optional[Searcher] = None
+
+
+def _init_worker(table_bytes: int, bitbase_dir: Optional[str]):
+    global _worker_searcher
+    from engine import Bitbases
+
+    bitbases = Bitbases(bitbase_dir) if bitbase_dir else None
+    _worker_searcher = Searcher(TranspositionTable(table_bytes), bitbases=bitbases)
+
+
+def _analyse_position(fen: str, limits: SearchLimits) -> Tuple[Optional[str], int]:
+    """Best move and score for the side to move."""
+    board = chess.Board(fen)
+    if not any(board.generate_legal_moves()):
+        return None, -MATE_SCORE if board.is_check() else 0
+    if board.is_insufficient_material():
+        return None, 0
+    result = _worker_searcher.search(board, limits)
+    return result.move.uci() if result.move else None, result.score
+
+
+# -----------------------------------------------------------------------------
+# Generator pipeline
+# -----------------------------------------------------------------------------
+
+def iter_games(source: str) -> Iterator[Tuple[int, chess.pgn.Game]]:
+    if os.path.isdir(source):
+        archive = GameArchive(source)
+        for index in range(len(archive)):
+            yield index, archive.game(index)
+        return
+    with open(source, encoding="utf-8", errors="replace") as handle:
+        yield from enumerate(read_pgn_games(handle))
+
+
+def iter_positions(game: chess.pgn.Game) -> Iterator[Tuple[int, str, Optional[chess.Move]]]:
+    """``(key, fen, move played from it)`` for every position, the final one included."""
+    board = game.board()
+    for move in game.mainline_moves():
+        yield chess.polyglot.zobrist_hash(board), board.fen(), move
+        board.push(move)
+    yield chess.polyglot.zobrist_hash(board), board.fen(), None
+
+
+def completed_games(output: str) -> Set[int]:
+    """Game ids already written, dropping a partial last line left by a crash."""
+    done: Set[int] = set()
+    if not os.path.exists(output):
+        return done
+    good_bytes = 0
+    with open(output, "rb") as handle:
+        for line in handle:
+            try:
+                done.add(json.loads(line)["game"])
+            except (ValueError, KeyError):
+                break
+            good_bytes += len(line)
+    with open(output, "r+b") as handle:
+        handle.truncate(good_bytes)
+    return done
+
+
+def _clamp(score: int) -> int:
+    return max(-EVAL_CLAMP, min(EVAL_CLAMP, score))
+
+
+def game_report(
+    game_id: int, game: chess.pgn.Game, positions: List[Tuple[int, str, Optional[chess.Move]]],
+    cache: Dict[int, Tuple[Optional[str], int]], blunder_cp: int,
+) -> Dict:
+    board = game.board()
+    plies = []
+    for ply, (key, _, move) in enumerate(positions[:-1]):
+        best, score = cache[key]
+        _, reply_score = cache[positions[ply + 1][0]]
+        # Both scores from the mover's point of view: before, and after their move.
+        loss = max(0, _clamp(score) - _clamp(-reply_score))
+        white_score = score if board.turn == chess.WHITE else -score
+        plies.append(
+            {
+                "ply": ply + 1,
+                "move": move.uci(),
+                "san": board.san(move),
+                "best": best,
+                "score": white_score,
+                "loss": loss,
+                "blunder": loss >= blunder_cp,
+            }
+        )
+        board.push(move)
+    return {
+        "game": game_id,
+        "white": game.headers.get("White", "?"),
+        "black": game.headers.get("Black", "?"),
+        "result": game.headers.get("Result", "*"),
+        "plies": plies,
+    }
+
+
+# -----------------------------------------------------------------------------
+# Orchestration
+# -----------------------------------------------------------------------------
+
+def analyse(
+    source: str, output: str, limits: SearchLimits, workers: int, max_inflight: int,
+    blunder_cp: int = BLUNDER_CP, table_bytes: Optional[int] = None, cache_size: int = CACHE_POSITIONS,
+) -> int:
+    """Analyse every game in ``source`` not yet in ``output``; returns games written."""
+    config = load_config()
+    done = completed_games(output)
+    # Results for positions of open games, and how many open games use each.
+    cache: Dict[int, Tuple[Optional[str], int]] = {}
+    refs: Counter = Counter()
+    # Results no open game needs, least recently used first.
+    retired: "OrderedDict[int, Tuple[Optional[str], int]]" = OrderedDict()
+    inflight: Deque[Tuple[int, multiprocessing.pool.AsyncResult]] = deque()
+    queued: Set[int] = set()
+    open_games: Deque[Tuple[int, chess.pgn.Game, List]] = deque()
+    written = 0
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(workers, _init_worker, (table_bytes or config.hash_bytes, config.bitbase_dir)) as pool, \
+            open(output, "a", encoding="utf-8") as sink:
+
+        def drain_one():
+            key, job = inflight.popleft()
+            cache[key] = job.get()
+            queued.discard(key)
+
+        def release(positions):
+            for key in {key for key, _, _ in positions}:
+                refs[key] -= 1
+                if refs[key] == 0:
+                    del refs[key]
+                    retired[key] = cache.pop(key)
+                    if len(retired) > cache_size:
+                        retired.popitem(last=False)
+
+        def flush_ready():
+            nonlocal written
+            while open_games and all(key in cache for key, _, _ in open_games[0][2]):
+                game_id, game, positions = open_games.popleft()
+                sink.write(json.dumps(game_report(game_id, game, positions, cache, blunder_cp)) + "\n")
+                sink.flush()
+                written += 1
+                release(positions)
+
+        for game_id, game in iter_games(source):
+            if game_id in done:
+                continue
+            positions = list(iter_positions(game))
+            seen: Set[int] = set()
+            for key, fen, _ in positions:
+                if key in seen:
+                    continue  # repeated within this game
+                seen.add(key)
+                refs[key] += 1
+                if key in cache or key in queued:
+                    continue
+                if key in retired:
+                    cache[key] = retired.pop(key)
+                    continue
+                # Backpressure: wait for the oldest search before queueing more.
+                while len(inflight) >= max_inflight:
+                    drain_one()
+                    flush_ready()
+                inflight.append((key, pool.apply_async(_analyse_position, (fen, limits))))
+                queued.add(key)
+            open_games.append((game_id, game, positions))
+            flush_ready()
+
+        while inflight:
+            drain_one()
+            flush_ready()
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Analyse a game archive or PGN file with the copilot engine.")
+    parser.add_argument("source", help="Game archive directory or PGN file.")
+    parser.add_argument("output", help="JSON Lines file to write (appended to and resumed).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Search processes.")
+    parser.add_argument("--depth", type=int, default=4, help="Search depth per position (0 for no limit).")
+    parser.add_argument("--movetime", type=int, default=0, help="Time per position in ms (0 for no limit).")
+    parser.add_argument("--nodes", type=int, default=0, help="Node budget per position (0 for no limit).")
+    parser.add_argument("--blunder-cp", type=int, default=BLUNDER_CP, help="Centipawn loss flagged as a blunder.")
+    parser.add_argument("--max-inflight", type=int, help="Searches queued at once (default: 4 per worker).")
+    parser.add_argument("--hash-mb", type=int, help="Transposition table per worker (default: CHESS_ENGINE_HASH_MB).")
+    parser.add_argument(
+        "--cache-size", type=int, default=CACHE_POSITIONS,
+        help="Finished positions kept for transpositions into later games.",
+    )
+    args = parser.parse_args(argv)
+
+    limits = SearchLimits(depth=args.depth or None, nodes=args.nodes or None, movetime_ms=args.movetime or None)
+    if limits.depth is None and limits.nodes is None and limits.movetime_ms is None:
+        parser.error("Set at least one of --depth, --movetime or --nodes.")
+    written = analyse(
+        args.source,
+        args.output,
+        limits,
+        workers=max(1, args.workers),
+        max_inflight=args.max_inflight or 4 * max(1, args.workers),
+        blunder_cp=args.blunder_cp,
+        table_bytes=args.hash_mb * 1024 * 1024 if args.hash_mb else None,
+        cache_size=max(0, args.cache_size),
+    )
+    print(f"Analysed {written} games into {args.output}.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,28 +1,50 @@
-import random
-from typing import List, Optional
+import atexit
+import datetime
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 
-import pandas as pd
 import streamlit as st
-import streamlit.components.v1 as components
 
 try:
     import chess
-    import chess.svg
 except ImportError as exc:  # pragma: no cover - instructions for missing deps
     raise RuntimeError(
-        "python-chess is required. Install it with `pip install streamlit python-chess pandas`."
+        "python-chess is required. Install it with `pip install streamlit python-chess`."
     ) from exc
 
+from board_component import chessboard
+from game_state import GameState, game_state
+from move_history import HISTORY_PAGE_ROWS, MoveHistory
+from move_index import move_index
+from move_stats import MoveStats, StatsSink
+from session_store import CompactGame, SessionRegistry, SessionStore
+from engine import load_config
+
+# The search engine (NumPy, multiprocessing) and the SVG renderer are imported
+# where they are first needed, so a new replica serves its first page sooner.
+if TYPE_CHECKING:  # pragma: no cover - static analysis only
+    from game_archive import GameArchive
+    from engine import EngineJob, EngineService, ParallelSearcher, SearchLimits, SearchResult, Searcher, TranspositionTable
+
+logger = logging.getLogger(__name__)
 
 # -----------------------------------------------------------------------------
 # Session helpers
 # -----------------------------------------------------------------------------
 
 def init_state():
-    if "board" not in st.session_state:
-        st.session_state.board = chess.Board()
-    if "move_history" not in st.session_state:
-        st.session_state.move_history: List[str] = []
+    st.session_state.setdefault("session_id", uuid.uuid4().hex)
+    if "game" not in st.session_state:
+        st.session_state.game = CompactGame()
+    registry = get_session_registry()
+    if registry is not None:
+        registry.touch(st.session_state.session_id, st.session_state.game)
     if "player_is_white" not in st.session_state:
         st.session_state.player_is_white = True
     if "ai_enabled" not in st.session_state:
@@ -31,11 +53,59 @@ def init_state():
         st.session_state.status_message = ""
     st.session_state.setdefault("promotion_choice", "Queen")
     st.session_state.setdefault("selected_square", None)
+    st.session_state.setdefault("interactive_board", True)
+    st.session_state.setdefault("last_board_event", None)
+    st.session_state.setdefault("ai_job", None)
+    st.session_state.setdefault("ai_job_ply", None)
+    st.session_state.setdefault("ai_job_requested", None)
+    st.session_state.setdefault("ponder_job", None)
+    st.session_state.setdefault("ponder_move", None)
+    st.session_state.setdefault("ponder_ply", None)
+    st.session_state.setdefault("show_copilot_stats", False)
+    st.session_state.setdefault("pending_move_stats", None)
+    st.session_state.setdefault("last_move_stats", None)
+    st.session_state.setdefault("think_time_ms", default_think_time())
+    if not st.session_state.game.load():
+        st.session_state.status_message = "Your idle game could not be restored, so a new one was started."
+
+
+@st.cache_resource
+def default_think_time() -> int:
+    # Cached so a bad setting is logged once per process, not once per session.
+    movetime = load_config().movetime_ms
+    if movetime not in STRENGTH_LEVELS:
+        logger.warning(
+            "CHESS_ENGINE_MOVETIME_MS=%r is not a strength level (%s); new sessions start at %d ms.",
+            os.environ.get("CHESS_ENGINE_MOVETIME_MS"),
+            ", ".join(map(str, STRENGTH_LEVELS)),
+            DEFAULT_STRENGTH_MS,
+        )
+        return DEFAULT_STRENGTH_MS
+    return movetime
+
+
+@st.cache_resource
+def get_session_registry() -> Optional[SessionRegistry]:
+    config = load_config()
+    if not config.session_idle_seconds:
+        return None
+    # One sweeper per process; it watches every session's game.
+    directory = config.session_dir or os.path.join(tempfile.gettempdir(), "streamlit-chess-sessions")
+    registry = SessionRegistry(SessionStore(directory), config.session_idle_seconds)
+    atexit.register(registry.close)
+    return registry
+
+
+def current_board() -> chess.Board:
+    return st.session_state.game.board
 
 
 def reset_game(player_color: Optional[str] = None):
-    st.session_state.board = chess.Board()
-    st.session_state.move_history = []
+    cancel_ai_move()
+    st.session_state.game = CompactGame()
+    registry = get_session_registry()
+    if registry is not None:
+        registry.touch(st.session_state.session_id, st.session_state.game)
     if player_color is not None:
         st.session_state.player_is_white = player_color == "White"
     st.session_state.status_message = "New game started."
@@ -47,35 +117,58 @@ def reset_game(player_color: Optional[str] = None):
 # Rendering utilities
 # -----------------------------------------------------------------------------
 
+def current_game_state() -> GameState:
+    game: CompactGame = st.session_state.game
+    return game_state(game.board, game.repetitions)
+
+
 def render_board():
-    board = st.session_state.board
-    orientation = chess.WHITE if st.session_state.player_is_white else chess.BLACK
-    highlight = board.king(board.turn) if board.is_check() else None
+    import streamlit.components.v1 as components
+
+    from board_render import board_html
+
+    board = current_board()
+    highlight = current_game_state().check_square
     last_move = board.move_stack[-1] if board.move_stack else None
-    svg = chess.svg.board(board, orientation=orientation, lastmove=last_move, check=highlight, size=480)
-    html = f"""
-        <style>
-            .board-container {{
-                display: flex;
-                justify-content: center;
-                align-items: center;
-                padding: 0.5rem;
-            }}
-            .board-container svg {{
-                max-width: 100%;
-                height: auto;
-            }}
-        </style>
-        <div class="board-container">{svg}</div>
-    """
+    html = board_html(
+        board.board_fen(),
+        st.session_state.player_is_white,
+        last_move.uci() if last_move else None,
+        highlight,
+    )
     components.html(html, height=620)
 
 
+def movable_targets() -> Dict[str, List[str]]:
+    board = current_board()
+    player_color = chess.WHITE if st.session_state.player_is_white else chess.BLACK
+    if current_game_state().is_game_over or (st.session_state.ai_enabled and board.turn != player_color):
+        return {}
+    return move_index(board).target_names
+
+
+def render_interactive_board():
+    board = current_board()
+    event = chessboard(
+        board.board_fen(),
+        st.session_state.player_is_white,
+        board.move_stack[-1] if board.move_stack else None,
+        current_game_state().check_square,
+        movable_targets(),
+        len(board.move_stack),
+    )
+    if handle_board_event(event):
+        # Redraw with the new position (and the copilot's reply).
+        st.rerun()
+
+
 def render_click_grid():
-    board = st.session_state.board
+    board = current_board()
     orientation_white = st.session_state.player_is_white
     ranks = list(range(7, -1, -1)) if orientation_white else list(range(8))
     files = list(range(8)) if orientation_white else list(range(7, -1, -1))
+    selected = st.session_state.selected_square
+    targets = set(move_index(board).target_names.get(selected, [])) if selected else set()
 
     st.markdown("#### Click a piece, then its destination")
     for rank in ranks:
@@ -86,8 +179,10 @@ def render_click_grid():
             square_name = chess.square_name(square)
             symbol = piece.unicode_symbol() if piece else "·"
             label = f"{symbol}\n{square_name.upper()}"
-            if st.session_state.selected_square == square_name:
+            if selected == square_name:
                 label = f"➤ {label}"
+            elif square_name in targets:
+                label = f"◦ {label}"
             button_key = f"square_{square_name}"
             if cols[idx].button(label, key=button_key):
                 handle_square_click(square_name)
@@ -95,18 +190,20 @@ def render_click_grid():
 
 
 def show_move_history():
-    moves = st.session_state.move_history
-    rows = []
-    for idx in range(0, len(moves), 2):
-        rows.append(
-            {
-                "Move": idx // 2 + 1,
-                "White": moves[idx],
-                "Black": moves[idx + 1] if idx + 1 < len(moves) else "",
-            }
-        )
-    if rows:
-        st.table(pd.DataFrame(rows).set_index("Move"))
+    history: MoveHistory = st.session_state.game.history
+    if len(history):
+        pages = history.page_count()
+        page = pages - 1
+        if pages > 1:
+            # Keyed on the page count so a new page brings the view back to the latest moves.
+            page = st.select_slider(
+                "Moves",
+                options=range(pages),
+                value=pages - 1,
+                format_func=lambda p: f"{p * HISTORY_PAGE_ROWS + 1}–{min((p + 1) * HISTORY_PAGE_ROWS, history.row_count())}",
+                key=f"history_page_{pages}",
+            )
+        st.markdown(history.page_html(page), unsafe_allow_html=True)
     else:
         st.info("No moves yet. Enter a move using SAN (`e4`) or UCI (`e2e4`).")
 
@@ -115,13 +212,26 @@ def show_move_history():
 # Game logic
 # -----------------------------------------------------------------------------
 
-PIECE_VALUES = {
-    chess.PAWN: 1,
-    chess.KNIGHT: 3,
-    chess.BISHOP: 3,
-    chess.ROOK: 5,
-    chess.QUEEN: 9,
-    chess.KING: 0,
+# How often a waiting page checks whether the copilot has answered.
+COPILOT_POLL_SECONDS = 0.25
+
+# Per-move think time (ms) for each copilot strength level.
+STRENGTH_LEVELS = {
+    100: "Beginner",
+    250: "Casual",
+    500: "Club",
+    1000: "Strong",
+    2000: "Expert",
+    5000: "Master",
+}
+
+DEFAULT_STRENGTH_MS = 1000
+
+DRAW_MESSAGES = {
+    chess.Termination.STALEMATE: "Stalemate reached.",
+    chess.Termination.INSUFFICIENT_MATERIAL: "Draw by insufficient material.",
+    chess.Termination.SEVENTYFIVE_MOVES: "Draw by 75-move rule.",
+    chess.Termination.FIVEFOLD_REPETITION: "Draw by fivefold repetition.",
 }
 
 PROMOTION_LETTER_MAP = {
@@ -132,40 +242,128 @@ PROMOTION_LETTER_MAP = {
 }
 
 
-def evaluate_board(board: chess.Board, perspective: bool) -> float:
-    white_score = sum(PIECE_VALUES[p.piece_type] for p in board.piece_map().values() if p.color == chess.WHITE)
-    black_score = sum(PIECE_VALUES[p.piece_type] for p in board.piece_map().values() if p.color == chess.BLACK)
-    total = white_score - black_score
-    return total if perspective == chess.WHITE else -total
+@st.cache_resource
+def get_parallel_searcher() -> "ParallelSearcher":
+    from engine import ParallelSearcher
+
+    # Worker processes start once and serve every session in this process.
+    config = load_config()
+    searcher = ParallelSearcher(config.threads, config.hash_bytes, config.bitbase_dir)
+    atexit.register(searcher.close)
+    return searcher
+
+
+@st.cache_resource
+def get_engine_service() -> "EngineService":
+    from engine import EngineService
+
+    # One queue and worker set per process; sessions only submit and poll.
+    config = load_config()
+    service = EngineService(config.workers, config.queue_size, config.ponder_jobs or 0)
+    atexit.register(service.close)
+    return service
 
 
-def choose_ai_move(board: chess.Board) -> chess.Move:
-    perspective = board.turn
-    best_score = -float("inf")
-    best_moves: List[chess.Move] = []
+@st.cache_resource
+def get_transposition_table() -> "TranspositionTable":
+    from engine import TranspositionTable
 
-    for move in board.legal_moves:
-        board.push(move)
-        score = evaluate_board(board, perspective)
-        board.pop()
+    # One bounded table per process, shared by every session.
+    if load_config().threads > 1:
+        return get_parallel_searcher().table
+    return TranspositionTable(load_config().hash_bytes)
 
-        if score > best_score + 1e-6:
-            best_score = score
-            best_moves = [move]
-        elif abs(score - best_score) <= 1e-6:
-            best_moves.append(move)
 
-    return random.choice(best_moves) if best_moves else random.choice(list(board.legal_moves))
+def new_searcher() -> "Searcher":
+    from engine import Bitbases, Searcher
 
+    bitbase_dir = load_config().bitbase_dir
+    return Searcher(get_transposition_table(), bitbases=Bitbases(bitbase_dir) if bitbase_dir else None)
 
-def record_move(board: chess.Board, move: chess.Move):
-    san = board.san(move)
-    board.push(move)
-    st.session_state.move_history.append(san)
+
+def get_copilot() -> "Searcher":
+    # Per-game searcher so killer/history tables follow one game.
+    game: CompactGame = st.session_state.game
+    if game.copilot is None:
+        game.copilot = new_searcher()
+    return game.copilot
+
+
+def copilot_limits() -> "SearchLimits":
+    from engine import SearchLimits
+
+    config = load_config()
+    return SearchLimits(
+        depth=config.depth,
+        nodes=config.nodes,
+        movetime_ms=st.session_state.think_time_ms,
+    )
+
+
+def choose_ai_move(
+    board: chess.Board,
+    searcher: Union["Searcher", "ParallelSearcher"],
+    limits: "SearchLimits",
+    stop_event: Optional[threading.Event] = None,
+) -> Tuple[str, "SearchResult"]:
+    """Return where the move came from ("book" or "search") and the search result."""
+    # Runs on an engine service thread, so it must not touch st.session_state.
+    from engine import SearchResult
+
+    if stop_event is not None and stop_event.is_set():
+        return "search", SearchResult(move=None)  # cancelled before it started
+    config = load_config()
+    if config.book_path:
+        from engine import book_move
+
+        move = book_move(board, config.book_path)
+        if move is not None:
+            return "book", SearchResult(move=move)
+    return "search", searcher.search(board, limits, stop_event)
+
+
+def record_move(move: chess.Move) -> str:
+    game: CompactGame = st.session_state.game
+    san = game.push(move)
+    if current_game_state().is_game_over:
+        archive_game(game)
+    return san
+
+
+@st.cache_resource
+def get_game_archive() -> Optional["GameArchive"]:
+    archive_dir = load_config().archive_dir
+    if not archive_dir:
+        return None
+    from game_archive import GameArchive
+
+    return GameArchive(archive_dir)
+
+
+def archive_game(game: CompactGame):
+    archive = get_game_archive()
+    if archive is None:
+        return
+    outcome = current_game_state().outcome
+    if st.session_state.ai_enabled:
+        player, copilot = "Player", "Copilot"
+        white, black = (player, copilot) if st.session_state.player_is_white else (copilot, player)
+    else:
+        white, black = "Player 1", "Player 2"
+    headers = {
+        "Event": "Streamlit Chess",
+        "Date": datetime.date.today().strftime("%Y.%m.%d"),
+        "White": white,
+        "Black": black,
+        "Result": outcome.result() if outcome else "*",
+    }
+    if game.start_fen:
+        headers["FEN"] = game.start_fen
+    archive.append(game.moves(), headers)
 
 
 def attempt_player_move(move_text: str) -> bool:
-    board = st.session_state.board
+    board = current_board()
     player_turn = chess.WHITE if st.session_state.player_is_white else chess.BLACK
 
     if st.session_state.ai_enabled and board.turn != player_turn:
@@ -177,44 +375,212 @@ def attempt_player_move(move_text: str) -> bool:
         st.warning("Enter a move in SAN (`Nf3`) or UCI (`g1f3`).")
         return False
 
-    move: Optional[chess.Move] = None
-    try:
-        move = board.parse_san(move_text)
-    except ValueError:
-        try:
-            move = chess.Move.from_uci(move_text.lower())
-            if move not in board.legal_moves:
-                move = None
-        except ValueError:
-            move = None
-
+    move = move_index(board).parse(move_text)
     if move is None:
         st.error("Invalid move. Please try again.")
         return False
 
-    san = board.san(move)
-    board.push(move)
-    st.session_state.move_history.append(san)
+    san = record_move(move)
     st.session_state.status_message = f"Player played {san}"
     st.session_state.move_entry = ""
     return True
 
 
 def trigger_ai_move():
-    board = st.session_state.board
-    if board.is_game_over():
+    """Queue a copilot search for the current position and return immediately."""
+    from engine import EngineBusy
+
+    board = current_board()
+    if st.session_state.ai_job is not None or current_game_state().is_game_over:
         return
     ai_turn = board.turn
     if st.session_state.ai_enabled and ai_turn != (chess.WHITE if st.session_state.player_is_white else chess.BLACK):
-        ai_move = choose_ai_move(board)
-        san = board.san(ai_move)
-        board.push(ai_move)
-        st.session_state.move_history.append(san)
-        st.session_state.status_message = f"Copilot played {san}"
+        pondered = take_ponder_job()
+        if pondered is not None:
+            # Already searching (or done with) this very position: answer from it.
+            st.session_state.ai_job = pondered
+            st.session_state.ai_job_ply = st.session_state.game.ply
+            st.session_state.ai_job_requested = time.monotonic()
+            return
+        searcher: Union["Searcher", "ParallelSearcher"] = get_copilot()
+        if load_config().threads > 1:
+            searcher = get_parallel_searcher()
+        position, limits = board.copy(), copilot_limits()
+        try:
+            job = get_engine_service().submit(
+                st.session_state.session_id,
+                lambda stop: choose_ai_move(position, searcher, limits, stop),
+            )
+        except EngineBusy:
+            # Retried on the next rerun by collect_ai_move.
+            st.session_state.status_message = "The copilot is busy with other games and will move shortly."
+            return
+        st.session_state.ai_job = job
+        st.session_state.ai_job_ply = st.session_state.game.ply
+        st.session_state.ai_job_requested = job.submitted
+
+
+def cancel_ai_move():
+    for name in ("ai_job", "ponder_job"):
+        job = st.session_state[name]
+        if job is not None:
+            get_engine_service().cancel(job)
+        st.session_state[name] = None
+
+
+def start_ponder(result: "SearchResult"):
+    """Search the player's expected reply (the PV's second move) while they think."""
+    from engine import EngineBusy
+
+    config = load_config()
+    # The Lazy SMP pool searches one position at a time, so it is never spent on pondering.
+    if not config.ponder_jobs or config.threads > 1 or len(result.pv) < 2:
+        return
+    board = current_board()
+    expected = result.pv[1]
+    if current_game_state().is_game_over or not board.is_legal(expected):
+        return
+    position = board.copy()
+    position.push(expected)
+    if not any(position.generate_legal_moves()):
+        return
+    # Its own searcher: a missed ponder may still be stopping while the real search starts.
+    searcher, limits = new_searcher(), copilot_limits()
+    try:
+        job = get_engine_service().submit(
+            st.session_state.session_id,
+            lambda stop: choose_ai_move(position, searcher, limits, stop),
+            ponder=True,
+        )
+    except EngineBusy:
+        return  # other sessions are using this replica's ponder slots
+    st.session_state.ponder_job = job
+    st.session_state.ponder_move = expected
+    st.session_state.ponder_ply = st.session_state.game.ply + 1
+
+
+def take_ponder_job() -> Optional["EngineJob"]:
+    """The ponder search if the player made the predicted move; otherwise cancel it."""
+    job = st.session_state.ponder_job
+    if job is None:
+        return None
+    st.session_state.ponder_job = None
+    board = current_board()
+    hit = (
+        st.session_state.game.ply == st.session_state.ponder_ply
+        and board.move_stack[-1] == st.session_state.ponder_move
+    )
+    # A ponder search that never started, or was cut short for another session, is not worth keeping.
+    if hit and get_engine_service().adopt(job):
+        return job
+    get_engine_service().cancel(job)
+    return None
+
+
+def collect_ai_move():
+    """Play the copilot's move if its search has finished, then queue the next one if due."""
+    job = st.session_state.ai_job
+    if job is not None and job.done():
+        st.session_state.ai_job = None
+        game: CompactGame = st.session_state.game
+        if not job.cancelled and game.ply == st.session_state.ai_job_ply:
+            try:
+                source, result = job.future.result()
+            except Exception as exc:
+                st.session_state.status_message = f"The copilot failed to move: {exc}"
+                return
+            if job.preempted or result.move is None:
+                # Cut short before it was adopted: a ponder miss, so trigger_ai_move asks again.
+                trigger_ai_move()
+                return
+            ply = game.ply + 1
+            san = record_move(result.move)
+            st.session_state.status_message = f"Copilot played {san}"
+            if job.adopted and source == "search":
+                source = "ponder"
+            # Finished (with render timing) and logged once the board is drawn.
+            st.session_state.pending_move_stats = build_move_stats(job, source, result, ply, san)
+            start_ponder(result)
+    trigger_ai_move()
+
+
+def build_move_stats(job: "EngineJob", source: str, result: "SearchResult", ply: int, san: str) -> MoveStats:
+    requested = st.session_state.ai_job_requested or job.submitted
+    return MoveStats(
+        timestamp=datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="milliseconds"),
+        session=st.session_state.session_id,
+        ply=ply,
+        move=result.move.uci(),
+        san=san,
+        source=source,
+        depth=result.depth,
+        score=result.score,
+        nodes=result.nodes,
+        nps=int(result.nodes * 1000 / result.time_ms) if result.time_ms else 0,
+        pv=[move.uci() for move in result.pv],
+        search_ms=result.time_ms,
+        # Timed from when the move was wanted: a ponder search may have started (or ended) earlier.
+        queue_ms=max(0.0, job.started - requested) * 1000,
+        latency_ms=max(0.0, job.finished - requested) * 1000,
+        tt_hit_rate=result.stats.tt_hit_rate,
+        movegen_ms=result.stats.movegen_ms,
+        ordering_ms=result.stats.ordering_ms,
+        evaluation_ms=result.stats.evaluation_ms,
+    )
+
+
+@st.cache_resource
+def get_stats_sink() -> Optional[StatsSink]:
+    path = load_config().stats_log
+    if not path:
+        return None
+    sink = StatsSink(path)
+    atexit.register(sink.close)
+    return sink
+
+
+def finish_move_stats(render_ms: float):
+    stats: Optional[MoveStats] = st.session_state.pending_move_stats
+    if stats is None:
+        return
+    stats.render_ms = render_ms
+    if not st.session_state.interactive_board:
+        from board_render import render_cache_stats
+
+        stats.render_cache_hit_rate = render_cache_stats()["hit_rate"]
+    sink = get_stats_sink()
+    if sink is not None:
+        sink.emit(stats)
+    st.session_state.last_move_stats = stats
+    st.session_state.pending_move_stats = None
+
+
+def show_copilot_stats():
+    stats: Optional[MoveStats] = st.session_state.last_move_stats
+    if stats is None:
+        st.caption("No copilot move yet.")
+        return
+    st.caption(f"Ply {stats.ply}: {stats.san} ({stats.source})")
+    depth_col, nodes_col = st.columns(2)
+    depth_col.metric("Depth", stats.depth)
+    nodes_col.metric("Nodes", f"{stats.nodes:,}")
+    nps_col, latency_col = st.columns(2)
+    nps_col.metric("NPS", f"{stats.nps:,}")
+    latency_col.metric("Latency", f"{stats.latency_ms:.0f} ms")
+    st.json(json.loads(stats.to_json()), expanded=False)
+
+
+@st.fragment(run_every=COPILOT_POLL_SECONDS)
+def copilot_progress():
+    job = st.session_state.ai_job
+    if job is None or job.done():
+        # Redraw the whole page with the copilot's move.
+        st.rerun()
+    st.info("Copilot is thinking... please wait.")
 
 
 def handle_square_click(square_name: str):
-    board = st.session_state.board
+    board = current_board()
     player_color = chess.WHITE if st.session_state.player_is_white else chess.BLACK
     allowed_color = player_color if st.session_state.ai_enabled else board.turn
 
@@ -238,44 +604,52 @@ def handle_square_click(square_name: str):
         st.session_state.status_message = "Selection cleared."
         return
 
-    candidate_moves = [
-        move
-        for move in board.legal_moves
-        if chess.square_name(move.from_square) == selected and chess.square_name(move.to_square) == square_name
-    ]
+    if not play_from_to(selected, square_name):
+        st.session_state.selected_square = None
+
+
+def play_from_to(from_name: str, to_name: str) -> bool:
+    board = current_board()
+    candidate_moves = move_index(board).candidates(chess.parse_square(from_name), chess.parse_square(to_name))
 
     if not candidate_moves:
         st.warning("Illegal move. Try selecting a different destination.")
-        st.session_state.selected_square = None
-        return
+        return False
 
     suffix = ""
     if any(move.promotion for move in candidate_moves):
         choice = st.session_state.get("promotion_choice", "Queen").lower()
         suffix = PROMOTION_LETTER_MAP.get(choice, "q")
 
-    move_input = f"{selected}{square_name}{suffix}"
-    if attempt_player_move(move_input):
-        st.session_state.selected_square = None
-        if st.session_state.ai_enabled:
-            trigger_ai_move()
+    move_input = f"{from_name}{to_name}{suffix}"
+    if not attempt_player_move(move_input):
+        return False
+    st.session_state.selected_square = None
+    if st.session_state.ai_enabled:
+        trigger_ai_move()
+    return True
+
+
+def handle_board_event(event: Optional[dict]) -> bool:
+    # The component keeps returning its last value on every rerun; act on each
+    # submission once, and only if it was made against the current position.
+    if not event or event.get("nonce") == st.session_state.last_board_event:
+        return False
+    st.session_state.last_board_event = event.get("nonce")
+    if event.get("ply") != st.session_state.game.ply:
+        return False
+    return play_from_to(event["from"], event["to"])
 
 
 def display_status():
-    board = st.session_state.board
-    if board.is_checkmate():
-        winner = "White" if board.turn == chess.BLACK else "Black"
+    outcome = current_game_state().outcome
+    if outcome is None:
+        st.write(st.session_state.status_message)
+    elif outcome.termination == chess.Termination.CHECKMATE:
+        winner = "White" if outcome.winner == chess.WHITE else "Black"
         st.success(f"Checkmate! {winner} wins.")
-    elif board.is_stalemate():
-        st.info("Stalemate reached.")
-    elif board.is_insufficient_material():
-        st.info("Draw by insufficient material.")
-    elif board.is_seventyfive_moves():
-        st.info("Draw by 75-move rule.")
-    elif board.is_fivefold_repetition():
-        st.info("Draw by fivefold repetition.")
     else:
-        st.write(st.session_state.status_message)
+        st.info(DRAW_MESSAGES[outcome.termination])
 
 
 # -----------------------------------------------------------------------------
@@ -285,6 +659,7 @@ def display_status():
 def main():
     st.set_page_config(page_title="Streamlit Chess", layout="wide")
     init_state()
+    collect_ai_move()
 
     st.title("♟️ Streamlit Chess Arena")
     st.caption("Play chess against a lightweight copilot or pass-and-play with a teammate.")
@@ -294,6 +669,32 @@ def main():
         ai_toggle = st.checkbox("Play against copilot", value=st.session_state.ai_enabled)
         if ai_toggle != st.session_state.ai_enabled:
             st.session_state.ai_enabled = ai_toggle
+            if ai_toggle:
+                trigger_ai_move()
+            else:
+                cancel_ai_move()
+
+        st.select_slider(
+            "Copilot strength",
+            options=list(STRENGTH_LEVELS),
+            format_func=lambda ms: f"{STRENGTH_LEVELS[ms]} · {ms} ms",
+            key="think_time_ms",
+            help="Time budget per copilot move. The copilot plays the best move from its last completed search.",
+        )
+
+        st.checkbox(
+            "Interactive board",
+            key="interactive_board",
+            help="Click pieces directly on the board. Turn off for the classic picture plus square buttons.",
+        )
+
+        st.checkbox(
+            "Show copilot stats",
+            key="show_copilot_stats",
+            help="Depth, nodes, NPS, latency and time per search phase for the copilot's last move.",
+        )
+        # Filled once the board is drawn, so the latest move's render time is included.
+        stats_panel = st.container()
 
         color_choice = st.radio(
             "Choose your pieces",
@@ -316,14 +717,20 @@ def main():
             """
         )
 
-    render_board()
+    render_started = time.perf_counter()
+    if st.session_state.interactive_board:
+        render_interactive_board()
+    else:
+        render_board()
+    finish_move_stats((time.perf_counter() - render_started) * 1000)
+    if st.session_state.show_copilot_stats:
+        with stats_panel:
+            show_copilot_stats()
     display_status()
 
-    board = st.session_state.board
-    player_turn = chess.WHITE if st.session_state.player_is_white else chess.BLACK
-
-    if st.session_state.ai_enabled and board.turn != player_turn:
-        st.info("Copilot is thinking... please wait.")
+    thinking = st.session_state.ai_job is not None
+    if thinking:
+        copilot_progress()
 
     st.selectbox(
         "Promotion choice (used when a pawn reaches the back rank)",
@@ -331,15 +738,16 @@ def main():
         key="promotion_choice",
     )
 
-    helper_col, clear_col = st.columns([3, 1])
-    with helper_col:
-        selected = st.session_state.selected_square or "None"
-        st.caption(f"Selected square: **{selected.upper() if selected != 'None' else 'None'}**")
-    with clear_col:
-        if st.button("Clear selection"):
-            st.session_state.selected_square = None
+    if not st.session_state.interactive_board:
+        helper_col, clear_col = st.columns([3, 1])
+        with helper_col:
+            selected = st.session_state.selected_square or "None"
+            st.caption(f"Selected square: **{selected.upper() if selected != 'None' else 'None'}**")
+        with clear_col:
+            if st.button("Clear selection"):
+                st.session_state.selected_square = None
 
-    render_click_grid()
+        render_click_grid()
 
     with st.expander("Prefer typing a move?"):
         manual_move = st.text_input("Enter SAN or UCI move", key="manual_move")
@@ -352,6 +760,11 @@ def main():
     st.subheader("Move history")
     show_move_history()
 
+    if not thinking and st.session_state.ai_job is not None:
+        # A move made further down this run queued the copilot; redraw so the
+        # board and the progress poller catch up.
+        st.rerun()
+
 
 if __name__ == "__main__":
     main()
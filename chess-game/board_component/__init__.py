@@ -0,0 +1,39 @@
+import os
+from typing import Dict, List, Optional
+
+import chess
+import streamlit.components.v1 as components
+
+
+_FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
+_chessboard = components.declare_component("chessboard", path=_FRONTEND_DIR)
+
+
+def chessboard(
+    board_fen: str,
+    white_at_bottom: bool,
+    last_move: Optional[chess.Move],
+    check_square: Optional[chess.Square],
+    targets: Dict[str, List[str]],
+    ply: int,
+    key: str = "chessboard",
+) -> Optional[Dict]:
+    """Interactive board: one widget instead of an SVG plus a 64-button grid.
+
+    The browser keeps the board DOM between reruns and only repaints squares
+    whose contents changed. Selection happens client-side; ``targets`` maps each
+    movable square to its legal destinations. The return value is the last
+    ``{"from", "to", "ply", "nonce"}`` the player submitted, or ``None``.
+    """
+    return _chessboard(
+        fen=board_fen,
+        orientation="white" if white_at_bottom else "black",
+        lastMove=[chess.square_name(last_move.from_square), chess.square_name(last_move.to_square)]
+        if last_move
+        else None,
+        check=chess.square_name(check_square) if check_square is not None else None,
+        targets=targets,
+        ply=ply,
+        key=key,
+        default=None,
+    )
@@ -0,0 +1,61 @@
+import functools
+from typing import Dict, Optional
+
+import chess
+import chess.svg
+
+
+# Enough for every position currently on screen across a busy replica; the
+# opening position alone covers most of them.
+RENDER_CACHE_SIZE = 1024
+
+BOARD_SIZE = 480
+
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def board_html(
+    board_fen: str,
+    white_at_bottom: bool,
+    last_move_uci: Optional[str],
+    check_square: Optional[chess.Square],
+) -> str:
+    """Board markup for a piece placement, orientation, last move and check square.
+
+    Shared by every session in the process, so identical positions are rendered
+    once and served from the cache afterwards.
+    """
+    board = chess.Board(f"{board_fen} w - - 0 1")
+    svg = chess.svg.board(
+        board,
+        orientation=chess.WHITE if white_at_bottom else chess.BLACK,
+        lastmove=chess.Move.from_uci(last_move_uci) if last_move_uci else None,
+        check=check_square,
+        size=BOARD_SIZE,
+    )
+    return f"""
+        <style>
+            .board-container {{
+                display: flex;
+                justify-content: center;
+                align-items: center;
+                padding: 0.5rem;
+            }}
+            .board-container svg {{
+                max-width: 100%;
+                height: auto;
+            }}
+        </style>
+        <div class="board-container">{svg}</div>
+    """
+
+
+def render_cache_stats() -> Dict[str, float]:
+    info = board_html.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "capacity": info.maxsize,
+        "hit_rate": info.hits / lookups if lookups else 0.0,
+    }
@@ -0,0 +1,60 @@
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - static analysis only
+    from .batch_eval import evaluate_children
+    from .bitbase import Bitbases
+    from .book import book_move
+    from .config import EngineConfig, load_config
+    from .parallel import ParallelSearcher
+    from .search import SearchLimits, SearchResult, SearchStats, Searcher
+    from .service import EngineBusy, EngineJob, EngineService
+    from .tt import TranspositionTable, TTStats
+
+# Public names and the submodule defining each. Submodules load on first
+# access, so reading the config does not pull in NumPy or multiprocessing.
+_EXPORTS = {
+    "Bitbases": "bitbase",
+    "EngineBusy": "service",
+    "EngineConfig": "config",
+    "EngineJob": "service",
+    "EngineService": "service",
+    "ParallelSearcher": "parallel",
+    "SearchLimits": "search",
+    "SearchResult": "search",
+    "SearchStats": "search",
+    "Searcher": "search",
+    "TTStats": "tt",
+    "TranspositionTable": "tt",
+    "book_move": "book",
+    "evaluate_children": "batch_eval",
+    "load_config": "config",
+}
+
+# Spelled out so linters see the TYPE_CHECKING imports above as re-exports.
+__all__ = [
+    "Bitbases",
+    "EngineBusy",
+    "EngineConfig",
+    "EngineJob",
+    "EngineService",
+    "ParallelSearcher",
+    "SearchLimits",
+    "SearchResult",
+    "SearchStats",
+    "Searcher",
+    "TTStats",
+    "TranspositionTable",
+    "book_move",
+    "evaluate_children",
+    "load_config",
+]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,85 @@
+from typing import Sequence
+
+import chess
+import numpy as np
+
+from .evaluation import EG_TABLE, MAX_PHASE, MG_TABLE, PHASE_WEIGHTS
+
+
+# Indexed [color, piece_type, square]; piece type 0 is an all-zero "no piece" row.
+MG_ARRAY = np.array(MG_TABLE, dtype=np.int64)
+EG_ARRAY = np.array(EG_TABLE, dtype=np.int64)
+PHASE_ARRAY = np.array([0] + [PHASE_WEIGHTS[piece_type] for piece_type in chess.PIECE_TYPES], dtype=np.int64)
+
+_SHIFTS = np.arange(64, dtype=np.uint64)
+
+
+def _piece_planes(board: chess.Board) -> np.ndarray:
+    """0/1 occupancy planes shaped ``[color, piece_type, square]`` from the bitboards."""
+    masks = np.array(
+        [[0] + [board.pieces_mask(piece_type, color) for piece_type in chess.PIECE_TYPES] for color in (chess.BLACK, chess.WHITE)],
+        dtype=np.uint64,
+    )
+    return ((masks[:, :, None] >> _SHIFTS) & np.uint64(1)).astype(np.int64)
+
+
+def evaluate_children(board: chess.Board, moves: Sequence[chess.Move]) -> np.ndarray:
+    """Score every child position in one pass.
+
+    Returns the tapered evaluation of ``board`` after each of ``moves``, in
+    centipawns from the point of view of the side making the move (that is,
+    ``-evaluate(child)``). Moves must be legal in ``board``.
+    """
+    if not moves:
+        return np.zeros(0, dtype=np.int64)
+    if board.chess960:
+        raise ValueError("Batched evaluation only supports standard chess castling.")
+
+    planes = _piece_planes(board)
+    mg = int((planes * MG_ARRAY).sum())
+    eg = int((planes * EG_ARRAY).sum())
+    phase = int((planes.sum(axis=2) * PHASE_ARRAY).sum())
+
+    us = int(board.turn)
+    them = 1 - us
+    piece_on = (planes[us] * np.arange(7)[:, None]).sum(axis=0)
+    their_piece_on = (planes[them] * np.arange(7)[:, None]).sum(axis=0)
+
+    from_squares = np.fromiter((move.from_square for move in moves), dtype=np.int64, count=len(moves))
+    to_squares = np.fromiter((move.to_square for move in moves), dtype=np.int64, count=len(moves))
+    promotions = np.fromiter((move.promotion or 0 for move in moves), dtype=np.int64, count=len(moves))
+
+    moving = piece_on[from_squares]
+    landing = np.where(promotions > 0, promotions, moving)
+
+    captured = their_piece_on[to_squares]
+    captured_squares = to_squares
+    if board.ep_square is not None:
+        en_passant = (moving == chess.PAWN) & (to_squares == board.ep_square)
+        captured = np.where(en_passant, chess.PAWN, captured)
+        captured_squares = np.where(en_passant, to_squares + (-8 if us == chess.WHITE else 8), to_squares)
+
+    mg_delta = (
+        MG_ARRAY[us, landing, to_squares]
+        - MG_ARRAY[us, moving, from_squares]
+        - MG_ARRAY[them, captured, captured_squares]
+    )
+    eg_delta = (
+        EG_ARRAY[us, landing, to_squares]
+        - EG_ARRAY[us, moving, from_squares]
+        - EG_ARRAY[them, captured, captured_squares]
+    )
+
+    castling = (moving == chess.KING) & (np.abs(to_squares - from_squares) == 2)
+    if castling.any():
+        rank_base = from_squares - from_squares % 8
+        kingside = to_squares > from_squares
+        rook_from = rank_base + np.where(kingside, 7, 0)
+        rook_to = rank_base + np.where(kingside, 5, 3)
+        rook = np.full(len(moves), chess.ROOK)
+        mg_delta += np.where(castling, MG_ARRAY[us, rook, rook_to] - MG_ARRAY[us, rook, rook_from], 0)
+        eg_delta += np.where(castling, EG_ARRAY[us, rook, rook_to] - EG_ARRAY[us, rook, rook_from], 0)
+
+    child_phase = np.minimum(phase + PHASE_ARRAY[promotions] - PHASE_ARRAY[captured], MAX_PHASE)
+    scores = ((mg + mg_delta) * child_phase + (eg + eg_delta) * (MAX_PHASE - child_phase)) // MAX_PHASE
+    return scores if us == chess.WHITE else -scores
@@ -0,0 +1,190 @@
+"""Perft and search benchmarks for the copilot engine.
+
+Run ``python -m engine.bench`` from ``chess-game/``. Results are printed as one
+JSON document (or written with ``--output``) so runs can be diffed across
+commits. Perft node counts are checked against published values and the
+process exits non-zero on a mismatch.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Dict, List, Optional
+
+import chess
+
+from .evaluation import Evaluator, evaluate
+from .search import SearchLimits, Searcher
+from .tt import TranspositionTable
+
+
+# (name, FEN, {depth: expected nodes}) from the Chess Programming Wiki perft pages.
+PERFT_POSITIONS = [
+    ("startpos", chess.STARTING_FEN, {1: 20, 2: 400, 3: 8_902, 4: 197_281}),
+    (
+        "kiwipete",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        {1: 48, 2: 2_039, 3: 97_862},
+    ),
+    ("position3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", {1: 14, 2: 191, 3: 2_812, 4: 43_238}),
+    (
+        "position4",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        {1: 6, 2: 264, 3: 9_467},
+    ),
+    ("position5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", {1: 44, 2: 1_486, 3: 62_379}),
+    (
+        "position6",
+        "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+        {1: 46, 2: 2_079, 3: 89_890},
+    ),
+]
+
+# Middlegame and endgame positions for search benchmarks.
+SEARCH_POSITIONS = [
+    ("startpos", chess.STARTING_FEN),
+    ("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"),
+    ("italian", "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4"),
+    ("middlegame", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10"),
+    ("rook_endgame", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"),
+    ("pawn_race", "8/5k2/8/2P5/8/8/5Kp1/8 w - - 0 1"),
+]
+
+
+def perft(board: chess.Board, depth: int) -> int:
+    if depth == 1:
+        return board.legal_moves.count()
+    nodes = 0
+    for move in board.legal_moves:
+        board.push(move)
+        nodes += perft(board, depth - 1)
+        board.pop()
+    return nodes
+
+
+# -----------------------------------------------------------------------------
+# Benchmarks
+# -----------------------------------------------------------------------------
+
+def run_perft(max_depth: int) -> List[Dict]:
+    records = []
+    for name, fen, expected in PERFT_POSITIONS:
+        board = chess.Board(fen)
+        for depth, nodes_expected in sorted(expected.items()):
+            if depth > max_depth:
+                break
+            started = time.perf_counter()
+            nodes = perft(board, depth)
+            elapsed = time.perf_counter() - started
+            records.append(
+                {
+                    "position": name,
+                    "depth": depth,
+                    "nodes": nodes,
+                    "expected": nodes_expected,
+                    "ok": nodes == nodes_expected,
+                    "seconds": round(elapsed, 4),
+                    "nps": int(nodes / elapsed) if elapsed else None,
+                }
+            )
+    return records
+
+
+def run_evaluation(iterations: int) -> List[Dict]:
+    """Full versus incremental evaluation throughput on each search position."""
+    records = []
+    for name, fen in SEARCH_POSITIONS:
+        board = chess.Board(fen)
+        moves = list(board.legal_moves)
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            for move in moves:
+                board.push(move)
+                evaluate(board)
+                board.pop()
+        full = time.perf_counter() - started
+
+        evaluator = Evaluator(board)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            for move in moves:
+                evaluator.push(board, move)
+                evaluator.score(board)
+                evaluator.pop(board)
+        incremental = time.perf_counter() - started
+
+        count = iterations * len(moves)
+        records.append(
+            {
+                "position": name,
+                "evaluations": count,
+                "full_per_second": int(count / full) if full else None,
+                "incremental_per_second": int(count / incremental) if incremental else None,
+            }
+        )
+    return records
+
+
+def run_search(limits: SearchLimits, table_bytes: int) -> List[Dict]:
+    records = []
+    for name, fen in SEARCH_POSITIONS:
+        # A fresh table per position keeps runs independent of position order.
+        searcher = Searcher(TranspositionTable(table_bytes))
+        result = searcher.search(chess.Board(fen), limits)
+        seconds = result.time_ms / 1000
+        records.append(
+            {
+                "position": name,
+                "move": result.move.uci() if result.move else None,
+                "score": result.score,
+                "depth": result.depth,
+                "nodes": result.nodes,
+                "time_ms": result.time_ms,
+                "nps": int(result.nodes / seconds) if seconds else None,
+                "pv": [move.uci() for move in result.pv],
+                "tt_hit_rate": round(searcher.table.stats.hit_rate, 4),
+            }
+        )
+    return records
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the copilot engine.")
+    parser.add_argument("--perft-depth", type=int, default=3, help="Deepest perft level to run (0 to skip).")
+    parser.add_argument("--depth", type=int, default=4, help="Fixed-depth search benchmark depth (0 to skip).")
+    parser.add_argument("--movetime", type=int, default=1000, help="Fixed-time search budget in ms (0 to skip).")
+    parser.add_argument("--eval-iterations", type=int, default=200, help="Evaluation benchmark repetitions.")
+    parser.add_argument("--hash-mb", type=int, default=16, help="Transposition table size per search.")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+    args = parser.parse_args(argv)
+
+    table_bytes = args.hash_mb * 1024 * 1024
+    report: Dict = {
+        "python": platform.python_version(),
+        "python_chess": chess.__version__,
+        "machine": platform.machine(),
+    }
+    if args.perft_depth > 0:
+        report["perft"] = run_perft(args.perft_depth)
+    if args.eval_iterations > 0:
+        report["evaluation"] = run_evaluation(args.eval_iterations)
+    if args.depth > 0:
+        report["fixed_depth"] = run_search(SearchLimits(depth=args.depth), table_bytes)
+    if args.movetime > 0:
+        report["fixed_time"] = run_search(SearchLimits(movetime_ms=args.movetime), table_bytes)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(payload + "\n")
+    else:
+        print(payload)
+
+    return 0 if all(record["ok"] for record in report.get("perft", [])) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
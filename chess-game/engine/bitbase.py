@@ -0,0 +1,279 @@
+"""Win/draw bitbases for KPK, KRK and KQK.
+
+Each table has one bit per position, indexed
+``((stm * 64 + strong_king) * 64 + weak_king) * 64 + piece`` with ``stm`` 0 when
+the strong side is to move. A set bit means the strong side wins with best
+play; a clear bit means a draw (or an unreachable position). The weak side can
+never win these endgames, so this is enough to answer win/draw/loss from the
+side to move. Positions with the strong side as Black are mirrored first.
+
+Build the files once with ``python -m engine.bitbase <directory>``.
+"""
+
+import argparse
+import functools
+import os
+from typing import Dict, Iterator, Optional, Tuple
+
+import chess
+import numpy as np
+
+
+TABLES = ("kqk", "krk", "kpk")
+TABLE_PIECES = {"kqk": chess.QUEEN, "krk": chess.ROOK, "kpk": chess.PAWN}
+TABLE_BITS = 2 * 64 * 64 * 64
+TABLE_BYTES = TABLE_BITS // 8
+
+WDL_LOSS = -1
+WDL_DRAW = 0
+WDL_WIN = 1
+
+# Scores for known wins sit well below mate scores so real mates still win out.
+KNOWN_WIN = 10_000
+
+_ROOK_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+_BISHOP_DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+_KING_DIRECTIONS = _ROOK_DIRECTIONS + _BISHOP_DIRECTIONS
+_SLIDER_DIRECTIONS = {
+    chess.ROOK: _ROOK_DIRECTIONS,
+    chess.QUEEN: _KING_DIRECTIONS,
+}
+
+# How far each square is from the centre, 0 (d4/e4/d5/e5) to 6 (corners).
+CENTER_DISTANCE = [
+    max(3 - chess.square_file(square), chess.square_file(square) - 4)
+    + max(3 - chess.square_rank(square), chess.square_rank(square) - 4)
+    for square in chess.SQUARES
+]
+
+
+# -----------------------------------------------------------------------------
+# Retrograde generation
+# -----------------------------------------------------------------------------
+
+_SQ = np.arange(64)
+_WK, _BK, _PC = np.meshgrid(_SQ, _SQ, _SQ, indexing="ij")
+
+
+def _step(square: np.ndarray, file_delta: int, rank_delta: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Target squares one step away and whether they stay on the board."""
+    files = square % 8 + file_delta
+    ranks = square // 8 + rank_delta
+    on_board = (files >= 0) & (files < 8) & (ranks >= 0) & (ranks < 8)
+    return np.where(on_board, ranks * 8 + files, 0), on_board
+
+
+def _king_adjacency() -> np.ndarray:
+    adjacent = np.zeros((64, 64), dtype=bool)
+    for square in chess.SQUARES:
+        for target in chess.SquareSet(chess.BB_KING_ATTACKS[square]):
+            adjacent[square, target] = True
+    return adjacent
+
+
+def _piece_attacks(piece_type: chess.PieceType) -> np.ndarray:
+    """``attacks[king, piece, square]``: squares the strong piece hits, blocked only by its own king."""
+    attacks = np.zeros((64, 64, 64), dtype=bool)
+    for king in chess.SQUARES:
+        for piece in chess.SQUARES:
+            if piece_type == chess.PAWN:
+                mask = chess.BB_PAWN_ATTACKS[chess.WHITE][piece]
+            else:
+                mask = 0
+                occupied = chess.BB_SQUARES[king]
+                if piece_type in (chess.ROOK, chess.QUEEN):
+                    mask |= chess.BB_RANK_ATTACKS[piece][chess.BB_RANK_MASKS[piece] & occupied]
+                    mask |= chess.BB_FILE_ATTACKS[piece][chess.BB_FILE_MASKS[piece] & occupied]
+                if piece_type == chess.QUEEN:
+                    mask |= chess.BB_DIAG_ATTACKS[piece][chess.BB_DIAG_MASKS[piece] & occupied]
+            for target in chess.SquareSet(mask):
+                attacks[king, piece, target] = True
+    return attacks
+
+
+def _flat(wk: np.ndarray, bk: np.ndarray, piece: np.ndarray) -> np.ndarray:
+    return ((wk * 64 + bk) * 64 + piece).astype(np.int32)
+
+
+def _strong_moves(
+    piece_type: chess.PieceType, adjacent: np.ndarray
+) -> Iterator[Tuple[np.ndarray, np.ndarray, Optional[str]]]:
+    """Yield ``(legal, child_index, promotion_table)`` for every strong-side move."""
+    for file_delta, rank_delta in _KING_DIRECTIONS:
+        target, on_board = _step(_WK, file_delta, rank_delta)
+        legal = on_board & (target != _PC) & (target != _BK) & ~adjacent[target, _BK]
+        yield legal, _flat(target, _BK, _PC), None
+
+    if piece_type == chess.PAWN:
+        target = _PC + 8
+        free = (target != _WK) & (target != _BK) & (_PC >= 8) & (_PC < 56)
+        promotes = target >= 56
+        yield free & ~promotes, _flat(_WK, _BK, np.where(free, target, 0)), None
+        yield free & promotes, _flat(_WK, _BK, np.where(free, target, 0)), "promote"
+        double = _PC + 16
+        two_step = free & (_PC >= 8) & (_PC < 16) & (double != _WK) & (double != _BK)
+        yield two_step, _flat(_WK, _BK, np.where(two_step, double, 0)), None
+        return
+
+    for file_delta, rank_delta in _SLIDER_DIRECTIONS[piece_type]:
+        square, open_ray = _PC, np.ones(_PC.shape, dtype=bool)
+        for _ in range(7):
+            square, on_board = _step(square, file_delta, rank_delta)
+            open_ray &= on_board & (square != _WK) & (square != _BK)
+            yield open_ray.copy(), _flat(_WK, _BK, square), None
+
+
+def generate(piece_type: chess.PieceType, promotion_tables: Optional[Dict[str, np.ndarray]] = None) -> np.ndarray:
+    """Return a ``(2, 64, 64, 64)`` boolean win table for the given strong piece."""
+    adjacent = _king_adjacency()
+    attacks = _piece_attacks(piece_type)
+
+    distinct = (_WK != _BK) & (_WK != _PC) & (_BK != _PC)
+    valid = distinct & ~adjacent[_WK, _BK]
+    if piece_type == chess.PAWN:
+        valid &= (_PC >= 8) & (_PC < 56)
+    in_check = attacks[_WK, _PC, _BK]
+    valid_strong = valid & ~in_check
+    valid_weak = valid
+
+    # Weak king moves are fixed: precompute legality, captures and children once.
+    weak_moves = []
+    weak_can_move = np.zeros(_PC.shape, dtype=bool)
+    weak_can_capture = np.zeros(_PC.shape, dtype=bool)
+    for file_delta, rank_delta in _KING_DIRECTIONS:
+        target, on_board = _step(_BK, file_delta, rank_delta)
+        captures = on_board & (target == _PC) & ~adjacent[_WK, _PC]
+        quiet = on_board & (target != _PC) & (target != _WK) & ~adjacent[_WK, target] & ~attacks[_WK, _PC, target]
+        weak_can_move |= captures | quiet
+        weak_can_capture |= captures
+        weak_moves.append((quiet, _flat(_WK, target, _PC)))
+    checkmated = valid_weak & in_check & ~weak_can_move
+
+    promotion_wins = None
+    if piece_type == chess.PAWN:
+        # Black to move right after promotion: queen or (against stalemate) rook.
+        promotion_wins = promotion_tables["kqk"][1].ravel() | promotion_tables["krk"][1].ravel()
+
+    strong_moves = list(_strong_moves(piece_type, adjacent))
+    strong_win = np.zeros(_PC.shape, dtype=bool)
+    weak_lose = checkmated.copy()
+    while True:
+        weak_flat = weak_lose.ravel()
+        new_strong = np.zeros(_PC.shape, dtype=bool)
+        for legal, child, promotion in strong_moves:
+            table = promotion_wins if promotion else weak_flat
+            new_strong |= legal & table[child]
+        new_strong &= valid_strong
+
+        strong_flat = new_strong.ravel()
+        new_weak = valid_weak & weak_can_move & ~weak_can_capture
+        for quiet, child in weak_moves:
+            new_weak &= ~quiet | strong_flat[child]
+        new_weak |= checkmated
+
+        if np.array_equal(new_strong, strong_win) and np.array_equal(new_weak, weak_lose):
+            break
+        strong_win, weak_lose = new_strong, new_weak
+
+    return np.stack([strong_win, weak_lose])
+
+
+def build(directory: str) -> Dict[str, str]:
+    os.makedirs(directory, exist_ok=True)
+    tables: Dict[str, np.ndarray] = {}
+    paths = {}
+    for name in TABLES:
+        tables[name] = generate(TABLE_PIECES[name], tables)
+        paths[name] = os.path.join(directory, f"{name}.bin")
+        with open(paths[name], "wb") as handle:
+            handle.write(np.packbits(tables[name].ravel()).tobytes())
+    return paths
+
+
+# -----------------------------------------------------------------------------
+# Probing
+# -----------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=None)
+def _load_table(directory: str, name: str) -> bytes:
+    path = os.path.join(directory, f"{name}.bin")
+    if not os.path.isfile(path):
+        raise RuntimeError(
+            f"Bitbase {path!r} is missing. Build it with `python -m engine.bitbase {directory}`."
+        )
+    with open(path, "rb") as handle:
+        data = handle.read()
+    if len(data) != TABLE_BYTES:
+        raise RuntimeError(f"Bitbase {path!r} is corrupt: expected {TABLE_BYTES} bytes, got {len(data)}.")
+    return data
+
+
+class Bitbases:
+    """Lazily loaded KPK/KRK/KQK tables; each file is read on its first probe."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    @staticmethod
+    def applies(board: chess.Board) -> bool:
+        return chess.popcount(board.occupied) == 3 and not (board.knights | board.bishops)
+
+    def _lookup(self, board: chess.Board) -> Optional[Tuple[int, chess.Color]]:
+        """Raw win bit and strong colour, or ``None`` if no table covers ``board``."""
+        if not self.applies(board):
+            return None
+        for name in TABLES:
+            piece_type = TABLE_PIECES[name]
+            pieces = board.pieces_mask(piece_type, chess.WHITE) | board.pieces_mask(piece_type, chess.BLACK)
+            if pieces:
+                break
+        piece = chess.lsb(pieces)
+        strong = board.color_at(piece)
+        strong_king, weak_king = board.king(strong), board.king(not strong)
+        if strong == chess.BLACK:
+            strong_king, weak_king, piece = strong_king ^ 56, weak_king ^ 56, piece ^ 56
+        stm = 0 if board.turn == strong else 1
+        index = ((stm * 64 + strong_king) * 64 + weak_king) * 64 + piece
+        data = _load_table(self.directory, name)
+        return (data[index >> 3] >> (7 - (index & 7))) & 1, strong
+
+    def probe_wdl(self, board: chess.Board) -> Optional[int]:
+        """Win/draw/loss for the side to move, or ``None`` if not covered."""
+        found = self._lookup(board)
+        if found is None:
+            return None
+        wins, strong = found
+        if not wins:
+            return WDL_DRAW
+        return WDL_WIN if board.turn == strong else WDL_LOSS
+
+    def probe_score(self, board: chess.Board) -> Optional[int]:
+        """Search score for the side to move: known win plus a conversion bonus."""
+        wdl = self.probe_wdl(board)
+        if wdl is None or wdl == WDL_DRAW:
+            return wdl
+        strong = board.turn if wdl == WDL_WIN else not board.turn
+        strong_king, weak_king = board.king(strong), board.king(not strong)
+        pawns = board.pieces_mask(chess.PAWN, strong)
+        if pawns:
+            # Advance the pawn, with the king close behind it.
+            pawn = chess.lsb(pawns)
+            rank = chess.square_rank(pawn) if strong == chess.WHITE else 7 - chess.square_rank(pawn)
+            bonus = 50 * rank - 5 * chess.square_distance(strong_king, pawn)
+        else:
+            # Drive the lone king to the edge and bring ours closer.
+            bonus = 20 * CENTER_DISTANCE[weak_king] + 10 * (7 - chess.square_distance(strong_king, weak_king))
+        score = KNOWN_WIN + bonus
+        return score if wdl == WDL_WIN else -score
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build KPK/KRK/KQK bitbases for the copilot engine.")
+    parser.add_argument("directory", help="Output directory (point CHESS_ENGINE_BITBASES here).")
+    args = parser.parse_args()
+    for name, path in build(args.directory).items():
+        print(f"{name}: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import functools
+import os
+import random
+from typing import Optional
+
+import chess
+import chess.polyglot
+
+
+@functools.lru_cache(maxsize=None)
+def open_book(path: str) -> chess.polyglot.MemoryMappedReader:
+    """Memory-map a Polyglot ``.bin`` book once per process.
+
+    Entries are binary-searched by Zobrist key straight from the mapping, so the
+    book is never loaded into memory and every session shares the same pages.
+    """
+    if not os.path.isfile(path):
+        raise RuntimeError(f"Opening book not found at {path!r}. Check CHESS_ENGINE_BOOK.")
+    return chess.polyglot.open_reader(path)
+
+
+def book_move(board: chess.Board, path: str, rng: Optional[random.Random] = None) -> Optional[chess.Move]:
+    """Pick a book move with probability proportional to its weight, if any."""
+    try:
+        entry = open_book(path).weighted_choice(board, random=rng)
+    except IndexError:
+        return None
+    return entry.move
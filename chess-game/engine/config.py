@@ -0,0 +1,69 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+
+# -----------------------------------------------------------------------------
+# Environment helpers
+# -----------------------------------------------------------------------------
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = int(raw)
+    except ValueError as exc:
+        raise RuntimeError(f"{name} must be an integer, got {raw!r}.") from exc
+    return value if value > 0 else None
+
+
+def _env_path(name: str) -> Optional[str]:
+    raw = os.environ.get(name, "").strip()
+    return os.path.expanduser(raw) if raw else None
+
+
+# -----------------------------------------------------------------------------
+# Engine configuration
+# -----------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class EngineConfig:
+    depth: Optional[int] = None
+    nodes: Optional[int] = None
+    movetime_ms: Optional[int] = 1_000
+    hash_mb: int = 16
+    threads: int = 1
+    workers: int = 1
+    queue_size: int = 64
+    ponder_jobs: Optional[int] = 1
+    book_path: Optional[str] = None
+    bitbase_dir: Optional[str] = None
+    archive_dir: Optional[str] = None
+    stats_log: Optional[str] = None
+    session_dir: Optional[str] = None
+    session_idle_seconds: Optional[int] = 900
+
+    @property
+    def hash_bytes(self) -> int:
+        return self.hash_mb * 1024 * 1024
+
+
+def load_config() -> EngineConfig:
+    defaults = EngineConfig()
+    return EngineConfig(
+        depth=_env_int("CHESS_ENGINE_DEPTH", defaults.depth),
+        nodes=_env_int("CHESS_ENGINE_NODES", defaults.nodes),
+        movetime_ms=_env_int("CHESS_ENGINE_MOVETIME_MS", defaults.movetime_ms),
+        hash_mb=_env_int("CHESS_ENGINE_HASH_MB", defaults.hash_mb) or 1,
+        threads=_env_int("CHESS_ENGINE_THREADS", defaults.threads) or 1,
+        workers=_env_int("CHESS_ENGINE_WORKERS", defaults.workers) or 1,
+        queue_size=_env_int("CHESS_ENGINE_QUEUE", defaults.queue_size) or defaults.queue_size,
+        ponder_jobs=_env_int("CHESS_ENGINE_PONDER", defaults.ponder_jobs),
+        book_path=_env_path("CHESS_ENGINE_BOOK"),
+        bitbase_dir=_env_path("CHESS_ENGINE_BITBASES"),
+        archive_dir=_env_path("CHESS_GAME_ARCHIVE"),
+        stats_log=_env_path("CHESS_ENGINE_STATS_LOG"),
+        session_dir=_env_path("CHESS_SESSION_STORE"),
+        session_idle_seconds=_env_int("CHESS_SESSION_IDLE_SECONDS", defaults.session_idle_seconds),
+    )
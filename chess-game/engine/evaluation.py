@@ -0,0 +1,284 @@
+from typing import List, Tuple
+
+import chess
+
+
+PIECE_VALUES = {
+    chess.PAWN: 100,
+    chess.KNIGHT: 300,
+    chess.BISHOP: 300,
+    chess.ROOK: 500,
+    chess.QUEEN: 900,
+    chess.KING: 0,
+}
+
+# -----------------------------------------------------------------------------
+# Tapered piece-square tables (PeSTO values)
+# -----------------------------------------------------------------------------
+# Tables are written rank 8 first, as seen from White's side of the board, so a
+# white piece on square ``sq`` reads index ``sq ^ 56`` and a black piece reads
+# index ``sq``.
+
+MG_PIECE_VALUES = {
+    chess.PAWN: 82,
+    chess.KNIGHT: 337,
+    chess.BISHOP: 365,
+    chess.ROOK: 477,
+    chess.QUEEN: 1025,
+    chess.KING: 0,
+}
+
+EG_PIECE_VALUES = {
+    chess.PAWN: 94,
+    chess.KNIGHT: 281,
+    chess.BISHOP: 297,
+    chess.ROOK: 512,
+    chess.QUEEN: 936,
+    chess.KING: 0,
+}
+
+PHASE_WEIGHTS = {
+    chess.PAWN: 0,
+    chess.KNIGHT: 1,
+    chess.BISHOP: 1,
+    chess.ROOK: 2,
+    chess.QUEEN: 4,
+    chess.KING: 0,
+}
+MAX_PHASE = 24
+
+MG_PST = {
+    chess.PAWN: [
+        0, 0, 0, 0, 0, 0, 0, 0,
+        98, 134, 61, 95, 68, 126, 34, -11,
+        -6, 7, 26, 31, 65, 56, 25, -20,
+        -14, 13, 6, 21, 23, 12, 17, -23,
+        -27, -2, -5, 12, 17, 6, 10, -25,
+        -26, -4, -4, -10, 3, 3, 33, -12,
+        -35, -1, -20, -23, -15, 24, 38, -22,
+        0, 0, 0, 0, 0, 0, 0, 0,
+    ],
+    chess.KNIGHT: [
+        -167, -89, -34, -49, 61, -97, -15, -107,
+        -73, -41, 72, 36, 23, 62, 7, -17,
+        -47, 60, 37, 65, 84, 129, 73, 44,
+        -9, 17, 19, 53, 37, 69, 18, 22,
+        -13, 4, 16, 13, 28, 19, 21, -8,
+        -23, -9, 12, 10, 19, 17, 25, -16,
+        -29, -53, -12, -3, -1, 18, -14, -19,
+        -105, -21, -58, -33, -17, -28, -19, -23,
+    ],
+    chess.BISHOP: [
+        -29, 4, -82, -37, -25, -42, 7, -8,
+        -26, 16, -18, -13, 30, 59, 18, -47,
+        -16, 37, 43, 40, 35, 50, 37, -2,
+        -4, 5, 19, 50, 37, 37, 7, -2,
+        -6, 13, 13, 26, 34, 12, 10, 4,
+        0, 15, 15, 15, 14, 27, 18, 10,
+        4, 15, 16, 0, 7, 21, 33, 1,
+        -33, -3, -14, -21, -13, -12, -39, -21,
+    ],
+    chess.ROOK: [
+        32, 42, 32, 51, 63, 9, 31, 43,
+        27, 32, 58, 62, 80, 67, 26, 44,
+        -5, 19, 26, 36, 17, 45, 61, 16,
+        -24, -11, 7, 26, 24, 35, -8, -20,
+        -36, -26, -12, -1, 9, -7, 6, -23,
+        -45, -25, -16, -17, 3, 0, -5, -33,
+        -44, -16, -20, -9, -1, 11, -6, -71,
+        -19, -13, 1, 17, 16, 7, -37, -26,
+    ],
+    chess.QUEEN: [
+        -28, 0, 29, 12, 59, 44, 43, 45,
+        -24, -39, -5, 1, -16, 57, 28, 54,
+        -13, -17, 7, 8, 29, 56, 47, 57,
+        -27, -27, -16, -16, -1, 17, -2, 1,
+        -9, -26, -9, -10, -2, -4, 3, -3,
+        -14, 2, -11, -2, -5, 2, 14, 5,
+        -35, -8, 11, 2, 8, 15, -3, 1,
+        -1, -18, -9, 10, -15, -25, -31, -50,
+    ],
+    chess.KING: [
+        -65, 23, 16, -15, -56, -34, 2, 13,
+        29, -1, -20, -7, -8, -4, -38, -29,
+        -9, 24, 2, -16, -20, 6, 22, -22,
+        -17, -20, -12, -27, -30, -25, -14, -36,
+        -49, -1, -27, -39, -46, -44, -33, -51,
+        -14, -14, -22, -46, -44, -30, -15, -27,
+        1, 7, -8, -64, -43, -16, 9, 8,
+        -15, 36, 12, -54, 8, -28, 24, 14,
+    ],
+}
+
+EG_PST = {
+    chess.PAWN: [
+        0, 0, 0, 0, 0, 0, 0, 0,
+        178, 173, 158, 134, 147, 132, 165, 187,
+        94, 100, 85, 67, 56, 53, 82, 84,
+        32, 24, 13, 5, -2, 4, 17, 17,
+        13, 9, -3, -7, -7, -8, 3, -1,
+        4, 7, -6, 1, 0, -5, -1, -8,
+        13, 8, 8, 10, 13, 0, 2, -7,
+        0, 0, 0, 0, 0, 0, 0, 0,
+    ],
+    chess.KNIGHT: [
+        -58, -38, -13, -28, -31, -27, -63, -99,
+        -25, -8, -25, -2, -9, -25, -24, -52,
+        -24, -20, 10, 9, -1, -9, -19, -41,
+        -17, 3, 22, 22, 22, 11, 8, -18,
+        -18, -6, 16, 25, 16, 17, 4, -18,
+        -23, -3, -1, 15, 10, -3, -20, -22,
+        -42, -20, -10, -5, -2, -20, -23, -44,
+        -29, -51, -23, -15, -22, -18, -50, -64,
+    ],
+    chess.BISHOP: [
+        -14, -21, -11, -8, -7, -9, -17, -24,
+        -8, -4, 7, -12, -3, -13, -4, -14,
+        2, -8, 0, -1, -2, 6, 0, 4,
+        -3, 9, 12, 9, 14, 10, 3, 2,
+        -6, 3, 13, 19, 7, 10, -3, -9,
+        -12, -3, 8, 10, 13, 3, -7, -15,
+        -14, -18, -7, -1, 4, -9, -15, -27,
+        -23, -9, -23, -5, -9, -16, -5, -17,
+    ],
+    chess.ROOK: [
+        13, 10, 18, 15, 12, 12, 8, 5,
+        11, 13, 13, 11, -3, 3, 8, 3,
+        7, 7, 7, 5, 4, -3, -5, -3,
+        4, 3, 13, 1, 2, 1, -1, 2,
+        3, 5, 8, 4, -5, -6, -8, -11,
+        -4, 0, -5, -1, -7, -12, -8, -16,
+        -6, -6, 0, 2, -9, -9, -11, -3,
+        -9, 2, 3, -1, -5, -13, 4, -20,
+    ],
+    chess.QUEEN: [
+        -9, 22, 22, 27, 27, 19, 10, 20,
+        -17, 20, 32, 41, 58, 25, 30, 0,
+        -20, 6, 9, 49, 47, 35, 19, 9,
+        3, 22, 24, 45, 57, 40, 57, 36,
+        -18, 28, 19, 47, 31, 34, 39, 23,
+        -16, -27, 15, 6, 9, 17, 10, 5,
+        -22, -23, -30, -16, -16, -23, -36, -32,
+        -33, -28, -22, -43, -5, -32, -20, -41,
+    ],
+    chess.KING: [
+        -74, -35, -18, -18, -11, 15, 4, -17,
+        -12, 17, 14, 17, 17, 38, 23, 11,
+        10, 17, 23, 15, 20, 45, 44, 13,
+        -8, 22, 24, 27, 26, 33, 26, 3,
+        -18, -4, 21, 24, 27, 23, 9, -11,
+        -19, -3, 11, 21, 23, 16, 7, -9,
+        -27, -11, 4, 13, 14, 4, -5, -17,
+        -53, -34, -21, -11, -28, -14, -24, -43,
+    ],
+}
+
+
+def _signed_tables(values, pst) -> List[List[List[int]]]:
+    """``table[color][piece_type][square]``: material plus PST, signed for White."""
+    tables: List[List[List[int]]] = [[[0] * 64 for _ in range(7)] for _ in range(2)]
+    for piece_type in chess.PIECE_TYPES:
+        for square in chess.SQUARES:
+            tables[chess.WHITE][piece_type][square] = values[piece_type] + pst[piece_type][square ^ 56]
+            tables[chess.BLACK][piece_type][square] = -(values[piece_type] + pst[piece_type][square])
+    return tables
+
+
+MG_TABLE = _signed_tables(MG_PIECE_VALUES, MG_PST)
+EG_TABLE = _signed_tables(EG_PIECE_VALUES, EG_PST)
+
+
+def _taper(mg: int, eg: int, phase: int) -> int:
+    phase = min(phase, MAX_PHASE)
+    return (mg * phase + eg * (MAX_PHASE - phase)) // MAX_PHASE
+
+
+def evaluate_terms(board: chess.Board) -> Tuple[int, int, int]:
+    """Midgame score, endgame score (both White-relative) and game phase."""
+    mg = eg = phase = 0
+    for color in chess.COLORS:
+        for piece_type in chess.PIECE_TYPES:
+            mg_row = MG_TABLE[color][piece_type]
+            eg_row = EG_TABLE[color][piece_type]
+            for square in chess.scan_forward(board.pieces_mask(piece_type, color)):
+                mg += mg_row[square]
+                eg += eg_row[square]
+                phase += PHASE_WEIGHTS[piece_type]
+    return mg, eg, phase
+
+
+def evaluate(board: chess.Board) -> int:
+    """Tapered evaluation in centipawns from the side to move's point of view."""
+    total = _taper(*evaluate_terms(board))
+    return total if board.turn == chess.WHITE else -total
+
+
+# -----------------------------------------------------------------------------
+# Incremental evaluator
+# -----------------------------------------------------------------------------
+
+class Evaluator:
+    """Keeps :func:`evaluate` up to date as moves are pushed and popped.
+
+    Use :meth:`push` and :meth:`pop` in place of ``board.push``/``board.pop`` so
+    the running terms stay in sync with the board.
+    """
+
+    def __init__(self, board: chess.Board):
+        self.reset(board)
+
+    def reset(self, board: chess.Board):
+        self.mg, self.eg, self.phase = evaluate_terms(board)
+        self._stack: List[Tuple[int, int, int]] = []
+
+    def score(self, board: chess.Board) -> int:
+        total = _taper(self.mg, self.eg, self.phase)
+        return total if board.turn == chess.WHITE else -total
+
+    def push(self, board: chess.Board, move: chess.Move):
+        mg, eg, phase = self.mg, self.eg, self.phase
+        self._stack.append((mg, eg, phase))
+
+        color = board.turn
+        from_square, to_square = move.from_square, move.to_square
+        piece_type = board.piece_type_at(from_square)
+        mg_own, eg_own = MG_TABLE[color], EG_TABLE[color]
+
+        if piece_type == chess.KING and board.is_castling(move):
+            rank = chess.square_rank(from_square)
+            kingside = board.is_kingside_castling(move)
+            rook_from = chess.square(7 if kingside else 0, rank)
+            rook_to = chess.square(5 if kingside else 3, rank)
+            king_to = chess.square(6 if kingside else 2, rank)
+            if board.chess960:
+                rook_from = to_square
+            mg += mg_own[chess.KING][king_to] - mg_own[chess.KING][from_square]
+            eg += eg_own[chess.KING][king_to] - eg_own[chess.KING][from_square]
+            mg += mg_own[chess.ROOK][rook_to] - mg_own[chess.ROOK][rook_from]
+            eg += eg_own[chess.ROOK][rook_to] - eg_own[chess.ROOK][rook_from]
+        else:
+            mg -= mg_own[piece_type][from_square]
+            eg -= eg_own[piece_type][from_square]
+            landing = move.promotion or piece_type
+            mg += mg_own[landing][to_square]
+            eg += eg_own[landing][to_square]
+            if move.promotion:
+                phase += PHASE_WEIGHTS[move.promotion]
+
+            captured_square = to_square
+            captured_type = board.piece_type_at(to_square)
+            if captured_type is None and piece_type == chess.PAWN and to_square == board.ep_square:
+                captured_square = to_square - 8 if color == chess.WHITE else to_square + 8
+                captured_type = chess.PAWN
+            if captured_type is not None:
+                mg -= MG_TABLE[not color][captured_type][captured_square]
+                eg -= EG_TABLE[not color][captured_type][captured_square]
+                phase -= PHASE_WEIGHTS[captured_type]
+
+        self.mg, self.eg, self.phase = mg, eg, phase
+        board.push(move)
+
+    def pop(self, board: chess.Board) -> chess.Move:
+        move = board.pop()
+        self.mg, self.eg, self.phase = self._stack.pop()
+        return move
@@ -0,0 +1,15 @@
+import chess
+
+
+# 16-bit move codes: bits 0-5 from square, 6-11 to square, 12-14 promotion piece type.
+# Code 0 (a1a1) is never a legal move and doubles as "no move".
+NULL_MOVE_CODE = 0
+
+
+def encode_move(move: chess.Move) -> int:
+    return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+
+def decode_move(code: int) -> chess.Move:
+    promotion = (code >> 12) & 7
+    return chess.Move(code & 63, (code >> 6) & 63, promotion or None)
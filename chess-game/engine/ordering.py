@@ -0,0 +1,94 @@
+from array import array
+from typing import List, Optional
+
+import chess
+
+from .moves import NULL_MOVE_CODE, encode_move
+
+
+HASH_MOVE_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 28
+KILLER_SCORE = 1 << 26
+HISTORY_LIMIT = KILLER_SCORE - 1
+
+# Most valuable victim first, least valuable attacker breaks ties.
+MVV_LVA = [[victim * 8 - attacker for attacker in range(7)] for victim in range(7)]
+
+
+class MoveOrderer:
+    """Hash move, MVV-LVA captures, two killers per ply, then history.
+
+    Killer and history state is kept in flat arrays and survives across
+    iterations and moves; call :meth:`clear` when a new game starts.
+    """
+
+    def __init__(self, max_ply: int = 128):
+        self.max_ply = max_ply
+        self.killers = array("H", [NULL_MOVE_CODE]) * (2 * max_ply)
+        self.history = array("l", [0]) * (64 * 64)
+
+    def clear(self):
+        self.killers = array("H", [NULL_MOVE_CODE]) * (2 * self.max_ply)
+        self.history = array("l", [0]) * (64 * 64)
+
+    def new_search(self):
+        self.killers = array("H", [NULL_MOVE_CODE]) * (2 * self.max_ply)
+        history = self.history
+        for index in range(len(history)):
+            history[index] >>= 1
+
+    def order(
+        self,
+        board: chess.Board,
+        moves: List[chess.Move],
+        ply: int,
+        hash_move: Optional[chess.Move] = None,
+    ) -> List[chess.Move]:
+        piece_type_at = board.piece_type_at
+        ep_square = board.ep_square
+        first_killer = self.killers[2 * ply]
+        second_killer = self.killers[2 * ply + 1]
+        history = self.history
+
+        scores = []
+        for move in moves:
+            if move == hash_move:
+                scores.append(HASH_MOVE_SCORE)
+                continue
+            from_square, to_square = move.from_square, move.to_square
+            victim = piece_type_at(to_square)
+            if victim is None and to_square == ep_square and piece_type_at(from_square) == chess.PAWN:
+                victim = chess.PAWN
+            if victim is not None or move.promotion:
+                score = CAPTURE_SCORE + MVV_LVA[victim or 0][piece_type_at(from_square)]
+                if move.promotion:
+                    score += move.promotion * 64
+                scores.append(score)
+                continue
+            code = encode_move(move)
+            if code == first_killer:
+                scores.append(KILLER_SCORE + 1)
+            elif code == second_killer:
+                scores.append(KILLER_SCORE)
+            else:
+                scores.append(history[from_square * 64 + to_square])
+
+        order = sorted(range(len(moves)), key=scores.__getitem__, reverse=True)
+        return [moves[index] for index in order]
+
+    def record_cutoff(self, board: chess.Board, move: chess.Move, ply: int, depth: int):
+        """Reward a quiet move that caused a beta cutoff. ``board`` is before the move."""
+        if move.promotion or board.is_capture(move):
+            return
+        code = encode_move(move)
+        slot = 2 * ply
+        if self.killers[slot] != code:
+            self.killers[slot + 1] = self.killers[slot]
+            self.killers[slot] = code
+
+        index = move.from_square * 64 + move.to_square
+        history = self.history
+        history[index] += depth * depth
+        if history[index] > HISTORY_LIMIT:
+            for entry in range(len(history)):
+                history[entry] >>= 1
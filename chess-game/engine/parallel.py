@@ -0,0 +1,134 @@
+import multiprocessing
+import threading
+from multiprocessing import shared_memory
+from typing import List, Optional
+
+import chess
+
+from .bitbase import Bitbases
+from .search import SearchLimits, SearchResult, Searcher
+from .tt import BUCKET_BYTES, TranspositionTable, bucket_count_for
+
+
+# Helpers get this long to notice the stop signal once the main worker is done.
+HELPER_JOIN_TIMEOUT = 2.0
+# How often a running search checks its caller's stop token.
+STOP_POLL_SECONDS = 0.01
+
+
+# -----------------------------------------------------------------------------
+# Worker process side
+# -----------------------------------------------------------------------------
+
+_worker_searcher: Optional[Searcher] = None
+_worker_memory: Optional[shared_memory.SharedMemory] = None
+
+
+def _init_worker(memory_name: str, table_bytes: int, stop_event, bitbase_dir: Optional[str]):
+    global _worker_searcher, _worker_memory
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+    table = TranspositionTable(table_bytes, buffer=_worker_memory.buf)
+    bitbases = Bitbases(bitbase_dir) if bitbase_dir else None
+    _worker_searcher = Searcher(table, stop_event=stop_event, bitbases=bitbases)
+
+
+def _search_task(root_fen: str, moves: List[str], limits: SearchLimits, helper_id: int) -> SearchResult:
+    board = chess.Board(root_fen)
+    for uci in moves:
+        board.push_uci(uci)
+    _worker_searcher.helper_id = helper_id
+    return _worker_searcher.search(board, limits)
+
+
+# -----------------------------------------------------------------------------
+# Lazy SMP front-end
+# -----------------------------------------------------------------------------
+
+class ParallelSearcher:
+    """Lazy SMP over a persistent process pool sharing one transposition table.
+
+    Every worker searches the same position; they cooperate only through the
+    shared-memory table. The main worker's limits decide when everyone stops.
+    Workers are spawned once and reused for every search until :meth:`close`.
+    One search runs at a time; concurrent callers queue on an internal lock.
+
+    The workers share one stop event, so callers that may be cancelled pass a
+    per-search ``stop_event`` to :meth:`search`: setting it only ends that
+    caller's search, and a search cancelled while it waits for the lock never
+    reaches the pool.
+    """
+
+    def __init__(self, workers: int, table_bytes: int, bitbase_dir: Optional[str] = None):
+        if workers < 1:
+            raise ValueError("ParallelSearcher needs at least one worker.")
+        self.workers = workers
+        self.table_bytes = bucket_count_for(table_bytes) * BUCKET_BYTES
+        self._memory = shared_memory.SharedMemory(create=True, size=self.table_bytes)
+        self.table = TranspositionTable(self.table_bytes, buffer=self._memory.buf)
+
+        context = multiprocessing.get_context("spawn")
+        self._stop_event = context.Event()
+        self._pool = context.Pool(
+            workers,
+            initializer=_init_worker,
+            initargs=(self._memory.name, self.table_bytes, self._stop_event, bitbase_dir),
+        )
+        self._lock = threading.Lock()
+
+    def search(
+        self, board: chess.Board, limits: Optional[SearchLimits] = None, stop_event=None
+    ) -> SearchResult:
+        limits = limits or SearchLimits(depth=1)
+        root = board.root()
+        moves = [move.uci() for move in board.move_stack]
+
+        with self._lock:
+            if stop_event is not None and stop_event.is_set():
+                # Stopped while another search held the pool.
+                return SearchResult(move=next(iter(board.legal_moves), None))
+            self._stop_event.clear()
+            pending = [
+                self._pool.apply_async(_search_task, (root.fen(), moves, limits, helper_id))
+                for helper_id in range(self.workers)
+            ]
+            # The shared event is only set while this search holds the lock.
+            poll = STOP_POLL_SECONDS if stop_event is not None else None
+            while not pending[0].ready():
+                if stop_event is not None and stop_event.is_set():
+                    self._stop_event.set()
+                pending[0].wait(poll)
+            main = pending[0].get()
+            self._stop_event.set()
+
+            results = [main]
+            for job in pending[1:]:
+                try:
+                    results.append(job.get(HELPER_JOIN_TIMEOUT))
+                except multiprocessing.TimeoutError:
+                    continue
+
+        # Prefer the deepest completed iteration; the main worker wins ties.
+        best = max(results, key=lambda result: result.depth)
+        if best.depth == main.depth:
+            best = main
+        return SearchResult(
+            move=best.move,
+            score=best.score,
+            depth=best.depth,
+            nodes=sum(result.nodes for result in results),
+            time_ms=main.time_ms,
+            pv=best.pv,
+            stats=main.stats,
+        )
+
+    def stop(self):
+        """Stop whichever search holds the pool right now."""
+        self._stop_event.set()
+
+    def close(self):
+        self._stop_event.set()
+        self._pool.terminate()
+        self._pool.join()
+        self.table.release()
+        self._memory.close()
+        self._memory.unlink()
@@ -0,0 +1,371 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+import chess
+
+from .batch_eval import evaluate_children
+from .bitbase import Bitbases
+from .evaluation import Evaluator
+from .ordering import MoveOrderer
+from .see import see
+from .tt import BOUND_EXACT, BOUND_LOWER, BOUND_UPPER, TranspositionTable
+
+
+MATE_SCORE = 100_000
+MATE_BOUND = MATE_SCORE - 1_000
+INFINITY = MATE_SCORE + 1
+MAX_PLY = 128
+DEFAULT_TABLE_BYTES = 1 << 20
+# The clock is read once every CLOCK_CHECK_INTERVAL nodes.
+CLOCK_CHECK_INTERVAL = 128
+
+
+class SearchAborted(Exception):
+    pass
+
+
+@dataclass
+class SearchLimits:
+    depth: Optional[int] = None
+    nodes: Optional[int] = None
+    movetime_ms: Optional[int] = None
+
+    def max_depth(self) -> int:
+        return min(self.depth, MAX_PLY - 1) if self.depth else MAX_PLY - 1
+
+
+@dataclass
+class SearchStats:
+    """Where one search spent its time, plus its own transposition-table hit rate."""
+
+    movegen_ms: float = 0.0
+    ordering_ms: float = 0.0
+    evaluation_ms: float = 0.0
+    tt_probes: int = 0
+    tt_hits: int = 0
+
+    @property
+    def tt_hit_rate(self) -> float:
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+
+@dataclass
+class SearchResult:
+    move: Optional[chess.Move]
+    score: int = 0
+    depth: int = 0
+    nodes: int = 0
+    time_ms: int = 0
+    pv: List[chess.Move] = field(default_factory=list)
+    stats: SearchStats = field(default_factory=SearchStats)
+
+
+def score_to_tt(score: int, ply: int) -> int:
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def score_from_tt(score: int, ply: int) -> int:
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
+# -----------------------------------------------------------------------------
+# Negamax alpha-beta with iterative deepening
+# -----------------------------------------------------------------------------
+
+class Searcher:
+    """Reusable per game: move-ordering history carries over between moves.
+
+    ``stop_event`` lets another thread or process end the search early; when it
+    is omitted the searcher owns a private event that :meth:`stop` sets and each
+    new search clears. A caller that may stop a search before it has started
+    passes its own per-search token to :meth:`search` instead, which is read but
+    never cleared. ``helper_id`` > 0 makes this a Lazy SMP helper that
+    perturbs its root order and iteration schedule so it explores different
+    subtrees than the main thread sharing its table.
+
+    ``on_iteration`` is called with the partial result after every completed
+    iteration (the UCI front-end prints it as ``info``).
+
+    With ``bitbases`` set, KPK/KRK/KQK positions reached inside the tree are
+    scored straight from the tables. When the root itself is such an endgame,
+    root moves are restricted to those that keep the best result and leaves are
+    scored from the tables, so the search only has to find the fastest route.
+    """
+
+    def __init__(
+        self,
+        table: Optional[TranspositionTable] = None,
+        orderer: Optional[MoveOrderer] = None,
+        stop_event=None,
+        helper_id: int = 0,
+        bitbases: Optional[Bitbases] = None,
+        on_iteration: Optional[Callable[[SearchResult], None]] = None,
+    ):
+        self.table = table if table is not None else TranspositionTable(DEFAULT_TABLE_BYTES)
+        self.orderer = orderer if orderer is not None else MoveOrderer(MAX_PLY)
+        self._owns_stop_event = stop_event is None
+        self.stop_event = threading.Event() if stop_event is None else stop_event
+        self._stop = self.stop_event
+        self.helper_id = helper_id
+        self.bitbases = bitbases
+        self.on_iteration = on_iteration
+        self._root_in_bitbase = False
+        self.nodes = 0
+        self._node_limit: Optional[int] = None
+        self._deadline: Optional[float] = None
+        self._pv: List[List[chess.Move]] = [[] for _ in range(MAX_PLY + 1)]
+        self._evaluator: Optional[Evaluator] = None
+        # Phase timers in seconds, read with one perf_counter pair per call.
+        self._movegen_time = 0.0
+        self._ordering_time = 0.0
+        self._evaluation_time = 0.0
+        self._tt_probes = 0
+        self._tt_hits = 0
+
+    def search(
+        self, board: chess.Board, limits: Optional[SearchLimits] = None, stop_event=None
+    ) -> SearchResult:
+        limits = limits or SearchLimits(depth=1)
+        board = board.copy()
+        self._movegen_time = self._ordering_time = self._evaluation_time = 0.0
+        self._tt_probes = self._tt_hits = 0
+        root_moves = list(board.legal_moves)
+        if not root_moves:
+            return SearchResult(move=None)
+        if not board.chess960:
+            clock = time.perf_counter()
+            scores = evaluate_children(board, root_moves)
+            self._evaluation_time += time.perf_counter() - clock
+            root_moves = [root_moves[index] for index in (-scores).argsort(kind="stable")]
+        self._root_in_bitbase = self.bitbases is not None and self.bitbases.applies(board)
+        if self._root_in_bitbase:
+            root_moves = self._bitbase_root_moves(board, root_moves)
+        if self.helper_id and len(root_moves) > 2:
+            shift = self.helper_id % (len(root_moves) - 1)
+            root_moves[1:] = root_moves[1 + shift:] + root_moves[1:1 + shift]
+        if stop_event is not None:
+            self._stop = stop_event
+        else:
+            self._stop = self.stop_event
+            if self._owns_stop_event:
+                self.stop_event.clear()
+
+        started = time.perf_counter()
+        self.nodes = 0
+        self._node_limit = limits.nodes
+        self._deadline = started + limits.movetime_ms / 1000 if limits.movetime_ms else None
+        self._pv[0] = []
+        self.table.new_search()
+        self.orderer.new_search()
+        self._evaluator = Evaluator(board)
+        result = SearchResult(move=root_moves[0])
+
+        first_depth = 1 + (self.helper_id & 1)
+        for depth in range(min(first_depth, limits.max_depth()), limits.max_depth() + 1):
+            try:
+                score = self._root(board, root_moves, depth)
+            except SearchAborted:
+                if result.depth == 0 and self._pv[0]:
+                    # Out of budget before one full iteration: keep the best root move so far.
+                    result = SearchResult(move=self._pv[0][0], pv=list(self._pv[0]))
+                break
+            pv = list(self._pv[0])
+            result = SearchResult(move=pv[0], score=score, depth=depth, nodes=self.nodes, pv=pv)
+            if self.on_iteration is not None:
+                result.time_ms = int((time.perf_counter() - started) * 1000)
+                self.on_iteration(result)
+            if abs(score) >= MATE_BOUND or self._should_stop() or not self._has_time_for_next(started):
+                break
+            root_moves.remove(pv[0])
+            root_moves.insert(0, pv[0])
+
+        result.nodes = self.nodes
+        result.time_ms = int((time.perf_counter() - started) * 1000)
+        result.stats = SearchStats(
+            movegen_ms=self._movegen_time * 1000,
+            ordering_ms=self._ordering_time * 1000,
+            evaluation_ms=self._evaluation_time * 1000,
+            tt_probes=self._tt_probes,
+            tt_hits=self._tt_hits,
+        )
+        return result
+
+    def _bitbase_root_moves(self, board: chess.Board, moves: List[chess.Move]) -> List[chess.Move]:
+        outcomes = []
+        for move in moves:
+            board.push(move)
+            wdl = self.bitbases.probe_wdl(board)
+            board.pop()
+            # Captures into bare kings are draws; everything else stays in a table.
+            outcomes.append(-wdl if wdl is not None else 0)
+        best = max(outcomes)
+        return [move for move, outcome in zip(moves, outcomes) if outcome == best]
+
+    def _static_score(self, board: chess.Board) -> int:
+        clock = time.perf_counter()
+        score = None
+        if self._root_in_bitbase:
+            score = self.bitbases.probe_score(board)
+        if score is None:
+            score = self._evaluator.score(board)
+        self._evaluation_time += time.perf_counter() - clock
+        return score
+
+    def stop(self):
+        self.stop_event.set()
+        self._stop.set()
+
+    def _should_stop(self) -> bool:
+        if self._stop.is_set():
+            return True
+        if self._node_limit is not None and self.nodes >= self._node_limit:
+            return True
+        return self._deadline is not None and time.perf_counter() >= self._deadline
+
+    def _has_time_for_next(self, started: float) -> bool:
+        # The next iteration usually costs several times the previous ones, so
+        # don't start it once half the budget is gone.
+        if self._deadline is None:
+            return True
+        now = time.perf_counter()
+        return now - started < (self._deadline - started) / 2
+
+    def _check_limits(self):
+        if self._node_limit is not None and self.nodes >= self._node_limit:
+            raise SearchAborted
+        if self.nodes % CLOCK_CHECK_INTERVAL == 0:
+            if self._stop.is_set():
+                raise SearchAborted
+            if self._deadline is not None and time.perf_counter() >= self._deadline:
+                raise SearchAborted
+
+    def _root(self, board: chess.Board, moves: List[chess.Move], depth: int) -> int:
+        alpha, beta = -INFINITY, INFINITY
+        evaluator = self._evaluator
+        for move in moves:
+            evaluator.push(board, move)
+            score = -self._negamax(board, depth - 1, -beta, -alpha, 1)
+            evaluator.pop(board)
+            if score > alpha:
+                alpha = score
+                self._pv[0] = [move] + self._pv[1]
+        return alpha
+
+    def _negamax(self, board: chess.Board, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        self._check_limits()
+        self._pv[ply] = []
+
+        if board.halfmove_clock >= 100 or (board.halfmove_clock >= 4 and board.is_repetition(2)):
+            return 0
+        if self.bitbases is not None and not self._root_in_bitbase and self.bitbases.applies(board):
+            return self.bitbases.probe_score(board)
+        if depth <= 0 or ply >= MAX_PLY:
+            return self._quiesce(board, alpha, beta, ply)
+
+        key = self.table.key(board)
+        entry = self.table.probe(key)
+        self._tt_probes += 1
+        hash_move = None
+        if entry is not None:
+            self._tt_hits += 1
+            hash_move = entry.move
+            if entry.depth >= depth:
+                tt_score = score_from_tt(entry.score, ply)
+                if (
+                    entry.bound == BOUND_EXACT
+                    or (entry.bound == BOUND_LOWER and tt_score >= beta)
+                    or (entry.bound == BOUND_UPPER and tt_score <= alpha)
+                ):
+                    if hash_move is not None:
+                        self._pv[ply] = [hash_move]
+                    return tt_score
+
+        clock = time.perf_counter()
+        moves = list(board.legal_moves)
+        ordered = time.perf_counter()
+        self._movegen_time += ordered - clock
+        if not moves:
+            return -MATE_SCORE + ply if board.is_check() else 0
+        moves = self.orderer.order(board, moves, ply, hash_move)
+        self._ordering_time += time.perf_counter() - ordered
+
+        evaluator = self._evaluator
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = None
+        for move in moves:
+            evaluator.push(board, move)
+            score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            evaluator.pop(board)
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score >= beta:
+                self.orderer.record_cutoff(board, move, ply, depth)
+                self.table.store(key, move, score_to_tt(score, ply), depth, BOUND_LOWER)
+                return score
+            if score > alpha:
+                alpha = score
+                self._pv[ply] = [move] + self._pv[ply + 1]
+
+        bound = BOUND_EXACT if alpha > original_alpha else BOUND_UPPER
+        self.table.store(key, best_move, score_to_tt(best_score, ply), depth, bound)
+        return best_score
+
+    def _quiesce(self, board: chess.Board, alpha: int, beta: int, ply: int) -> int:
+        """Resolve captures and promotions so leaves are scored in quiet positions."""
+        if ply >= MAX_PLY:
+            return self._static_score(board)
+
+        in_check = board.is_check()
+        if in_check:
+            # No stand-pat while in check: every evasion must be tried.
+            clock = time.perf_counter()
+            moves = list(board.legal_moves)
+            self._movegen_time += time.perf_counter() - clock
+            if not moves:
+                return -MATE_SCORE + ply
+            best_score = -INFINITY
+        else:
+            best_score = self._static_score(board)
+            if best_score >= beta:
+                return best_score
+            alpha = max(alpha, best_score)
+            clock = time.perf_counter()
+            moves = list(board.generate_legal_captures())
+            moves.extend(
+                move
+                for move in board.generate_legal_moves(board.pawns, chess.BB_BACKRANKS & ~board.occupied)
+                if move.promotion == chess.QUEEN
+            )
+            self._movegen_time += time.perf_counter() - clock
+
+        evaluator = self._evaluator
+        clock = time.perf_counter()
+        moves = self.orderer.order(board, moves, ply)
+        self._ordering_time += time.perf_counter() - clock
+        for move in moves:
+            if not in_check and see(board, move) < 0:
+                continue
+            self.nodes += 1
+            self._check_limits()
+            evaluator.push(board, move)
+            score = -self._quiesce(board, -beta, -alpha, ply + 1)
+            evaluator.pop(board)
+            if score > best_score:
+                best_score = score
+                if score >= beta:
+                    return score
+                alpha = max(alpha, score)
+        return best_score
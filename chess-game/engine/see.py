@@ -0,0 +1,82 @@
+import chess
+
+from .evaluation import PIECE_VALUES
+
+
+# Kings can take part in an exchange but must never be "won" by it.
+SEE_VALUES = [0] + [PIECE_VALUES[piece_type] for piece_type in chess.PIECE_TYPES[:-1]] + [20_000]
+
+
+def _least_valuable_attacker(board: chess.Board, attackers: int, color: chess.Color):
+    for piece_type in chess.PIECE_TYPES:
+        candidates = attackers & board.pieces_mask(piece_type, color)
+        if candidates:
+            return piece_type, candidates & -candidates
+    return None, 0
+
+
+def _attackers(board: chess.Board, square: chess.Square, occupied: int) -> int:
+    """All pieces of either colour attacking ``square`` given a custom occupancy."""
+    rank_pieces = chess.BB_RANK_MASKS[square] & occupied
+    file_pieces = chess.BB_FILE_MASKS[square] & occupied
+    diag_pieces = chess.BB_DIAG_MASKS[square] & occupied
+
+    queens_and_rooks = board.queens | board.rooks
+    queens_and_bishops = board.queens | board.bishops
+
+    attackers = (
+        (chess.BB_KING_ATTACKS[square] & board.kings)
+        | (chess.BB_KNIGHT_ATTACKS[square] & board.knights)
+        | (chess.BB_RANK_ATTACKS[square][rank_pieces] & queens_and_rooks)
+        | (chess.BB_FILE_ATTACKS[square][file_pieces] & queens_and_rooks)
+        | (chess.BB_DIAG_ATTACKS[square][diag_pieces] & queens_and_bishops)
+        | (chess.BB_PAWN_ATTACKS[chess.WHITE][square] & board.pawns & board.occupied_co[chess.BLACK])
+        | (chess.BB_PAWN_ATTACKS[chess.BLACK][square] & board.pawns & board.occupied_co[chess.WHITE])
+    )
+    return attackers & occupied
+
+
+def see(board: chess.Board, move: chess.Move) -> int:
+    """Static exchange evaluation of ``move`` in centipawns for the side to move.
+
+    Plays out the cheapest recaptures on the target square, with x-ray attackers
+    revealed as pieces leave, and returns the material balance when both sides
+    stop at their best point. Pins and checks are ignored.
+    """
+    from_square, to_square = move.from_square, move.to_square
+    attacker_type = board.piece_type_at(from_square)
+    victim_type = board.piece_type_at(to_square)
+    occupied = board.occupied
+
+    if victim_type is None and attacker_type == chess.PAWN and to_square == board.ep_square:
+        victim_type = chess.PAWN
+        occupied ^= chess.BB_SQUARES[to_square - 8 if board.turn == chess.WHITE else to_square + 8]
+
+    gains = [SEE_VALUES[victim_type or 0]]
+    on_square = attacker_type
+    if move.promotion:
+        gains[0] += SEE_VALUES[move.promotion] - SEE_VALUES[chess.PAWN]
+        on_square = move.promotion
+
+    occupied ^= chess.BB_SQUARES[from_square]
+    color = not board.turn
+    attackers = _attackers(board, to_square, occupied)
+
+    while True:
+        piece_type, attacker = _least_valuable_attacker(board, attackers & board.occupied_co[color], color)
+        if not attacker:
+            break
+        gains.append(SEE_VALUES[on_square] - gains[-1])
+        if on_square == chess.KING:
+            # Taking the king makes the king's own capture a losing option.
+            break
+        on_square = piece_type
+        occupied ^= attacker
+        # Sliders behind the piece that just moved now join the exchange.
+        attackers = _attackers(board, to_square, occupied)
+        color = not color
+
+    while len(gains) > 1:
+        last = gains.pop()
+        gains[-1] = -max(-gains[-1], last)
+    return gains[0]
@@ -0,0 +1,168 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future
+from typing import Any, Callable, List, Optional
+
+
+class EngineBusy(RuntimeError):
+    """The request queue is full; try again on a later rerun."""
+
+
+class EngineJob:
+    """One queued copilot request. ``future`` resolves to whatever ``run`` returns.
+
+    ``run`` is called with the job's own ``stop_event``, which is set when the
+    job is cancelled or preempted and never cleared, so a cancel that lands
+    before the search starts is not lost.
+    """
+
+    def __init__(self, session_id: str, run: Callable[[threading.Event], Any], ponder: bool = False):
+        self.session_id = session_id
+        self.ponder = ponder
+        self.future: Future = Future()
+        self.submitted = time.monotonic()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.cancelled = False
+        self.stop_event = threading.Event()
+        # A ponder job cut short to make room for a real request.
+        self.preempted = False
+        # A ponder job whose position came up, now answering a real request.
+        self.adopted = False
+        self._run = run
+
+    def done(self) -> bool:
+        return self.future.done()
+
+
+class EngineService:
+    """Process-wide copilot queue shared by every Streamlit session.
+
+    Sessions submit work and return straight away; a fixed number of worker
+    threads run it. Each session holds at most one queued request (a newer one
+    replaces it) and sessions are served in the order they started waiting,
+    so one busy player cannot starve the rest. At most ``max_pending``
+    sessions may wait at once.
+
+    Ponder jobs (searches on the reply a player is expected to make) are
+    queued separately. At most ``max_ponder`` are queued or running at once.
+    They only start when no real request is waiting. A real request that
+    finds every worker busy interrupts the oldest running ponder job. A ponder
+    job its session has adopted (:meth:`adopt`) counts as a real request and
+    is never interrupted.
+    """
+
+    def __init__(self, workers: int = 1, max_pending: int = 64, max_ponder: int = 1):
+        if workers < 1:
+            raise ValueError("EngineService needs at least one worker.")
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_ponder = max_ponder
+        self._pending: "OrderedDict[str, EngineJob]" = OrderedDict()
+        self._ponder_pending: "OrderedDict[str, EngineJob]" = OrderedDict()
+        self._running: List[EngineJob] = []
+        self._condition = threading.Condition()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"engine-service-{index}", daemon=True)
+            for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, session_id: str, run: Callable[[threading.Event], Any], ponder: bool = False) -> EngineJob:
+        """Queue ``run`` for ``session_id``. It should return early once its stop event is set."""
+        job = EngineJob(session_id, run, ponder)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("EngineService is closed.")
+            pending = self._ponder_pending if ponder else self._pending
+            # A newer request replaces the old one in its slot, keeping the session's place in line.
+            previous = pending.get(session_id)
+            if previous is not None:
+                previous.cancelled = True
+                previous.future.cancel()
+            elif ponder and self._ponder_count() >= self.max_ponder:
+                raise EngineBusy(f"{self.max_ponder} ponder searches are already running.")
+            elif not ponder and len(self._pending) >= self.max_pending:
+                raise EngineBusy(f"{len(self._pending)} copilot requests are already waiting.")
+            pending[session_id] = job
+            if not ponder and len(self._running) >= self.workers:
+                preempt = next((other for other in self._running if other.ponder and not other.preempted), None)
+                if preempt is not None:
+                    # Its token stays set, so this holds even if its search has not started yet.
+                    preempt.preempted = True
+                    preempt.stop_event.set()
+            self._condition.notify()
+        return job
+
+    def cancel(self, job: EngineJob):
+        with self._condition:
+            job.cancelled = True
+            job.stop_event.set()
+            pending = self._ponder_pending if job.ponder else self._pending
+            if pending.get(job.session_id) is job:
+                del pending[job.session_id]
+                job.future.cancel()
+
+    def adopt(self, job: EngineJob) -> bool:
+        """Turn a started ponder job into the session's real request.
+
+        Returns False if it was cancelled, preempted or has not started; the
+        caller should then submit a normal request instead.
+        """
+        with self._condition:
+            if job.cancelled or job.preempted or job.started is None:
+                return False
+            job.ponder = False
+            job.adopted = True
+            return True
+
+    def _ponder_count(self) -> int:
+        return len(self._ponder_pending) + sum(1 for job in self._running if job.ponder)
+
+    def queue_depth(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            for pending in (self._pending, self._ponder_pending):
+                for job in pending.values():
+                    job.cancelled = True
+                    job.future.cancel()
+                pending.clear()
+            running = list(self._running)
+            self._condition.notify_all()
+        for job in running:
+            self.cancel(job)
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._ponder_pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                _, job = (self._pending or self._ponder_pending).popitem(last=False)
+                job.future.set_running_or_notify_cancel()
+                job.started = time.monotonic()
+                self._running.append(job)
+            try:
+                # Cancelled between dequeue and start, or mid-search: never hand back a move.
+                if job.cancelled:
+                    raise CancelledError()
+                result = job._run(job.stop_event)
+                if job.cancelled:
+                    raise CancelledError()
+            except BaseException as exc:  # surfaced to the session on its next rerun
+                job.finished = time.monotonic()
+                job.future.set_exception(exc)
+            else:
+                job.finished = time.monotonic()
+                job.future.set_result(result)
+            finally:
+                with self._condition:
+                    self._running.remove(job)
@@ -0,0 +1,159 @@
+from dataclasses import dataclass
+from typing import NamedTuple, Optional
+
+import chess
+import chess.polyglot
+
+from .moves import NULL_MOVE_CODE, decode_move, encode_move
+
+
+BOUND_EXACT = 1
+BOUND_LOWER = 2
+BOUND_UPPER = 3
+
+# Each bucket holds two entries of two 64-bit words (key ^ data, data): slot 0 is
+# depth-preferred, slot 1 is always-replace.
+ENTRY_WORDS = 2
+BUCKET_WORDS = 2 * ENTRY_WORDS
+BUCKET_BYTES = BUCKET_WORDS * 8
+
+_SCORE_OFFSET = 1 << 23
+_MASK_64 = (1 << 64) - 1
+
+
+class TTEntry(NamedTuple):
+    move: Optional[chess.Move]
+    score: int
+    depth: int
+    bound: int
+
+
+@dataclass
+class TTStats:
+    probes: int = 0
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    collisions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+
+def _pack(move_code: int, score: int, depth: int, bound: int, generation: int) -> int:
+    return (
+        move_code
+        | ((score + _SCORE_OFFSET) << 16)
+        | (max(depth, 0) << 40)
+        | (bound << 48)
+        | (generation << 50)
+    )
+
+
+def bucket_count_for(size_bytes: int) -> int:
+    """Largest power-of-two bucket count that fits in ``size_bytes``."""
+    buckets = 1
+    while buckets * 2 * BUCKET_BYTES <= size_bytes:
+        buckets *= 2
+    return buckets
+
+
+# -----------------------------------------------------------------------------
+# Transposition table
+# -----------------------------------------------------------------------------
+
+class TranspositionTable:
+    """Fixed-size hash table keyed on the Polyglot Zobrist key of a position.
+
+    The table never grows past ``size_bytes``. Pass ``buffer`` to lay it over
+    memory owned by someone else (it must be at least ``size_bytes`` long).
+    """
+
+    def __init__(self, size_bytes: int, buffer=None):
+        self.buckets = bucket_count_for(size_bytes)
+        self.size_bytes = self.buckets * BUCKET_BYTES
+        if buffer is None:
+            buffer = bytearray(self.size_bytes)
+        self._bytes = memoryview(buffer)[: self.size_bytes]
+        self._words = self._bytes.cast("Q")
+        self._mask = self.buckets - 1
+        self.generation = 0
+        self.stats = TTStats()
+
+    @staticmethod
+    def key(board: chess.Board) -> int:
+        return chess.polyglot.zobrist_hash(board)
+
+    def new_search(self):
+        self.generation = (self.generation + 1) & 0xFF
+
+    def clear(self):
+        self._bytes[:] = bytes(self.size_bytes)
+        self.generation = 0
+        self.stats = TTStats()
+
+    def release(self):
+        """Drop the views onto the backing buffer so shared memory can be closed."""
+        self._words.release()
+        self._bytes.release()
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        stats = self.stats
+        stats.probes += 1
+        words = self._words
+        base = (key & self._mask) * BUCKET_WORDS
+        for offset in (0, ENTRY_WORDS):
+            data = words[base + offset + 1]
+            if data and words[base + offset] ^ data == key:
+                stats.hits += 1
+                move_code = data & 0xFFFF
+                return TTEntry(
+                    move=decode_move(move_code) if move_code != NULL_MOVE_CODE else None,
+                    score=((data >> 16) & 0xFFFFFF) - _SCORE_OFFSET,
+                    depth=(data >> 40) & 0xFF,
+                    bound=(data >> 48) & 3,
+                )
+        stats.misses += 1
+        return None
+
+    def store(self, key: int, move: Optional[chess.Move], score: int, depth: int, bound: int):
+        stats = self.stats
+        stats.stores += 1
+        words = self._words
+        base = (key & self._mask) * BUCKET_WORDS
+
+        slot = base + ENTRY_WORDS
+        old_data = words[slot + 1]
+        old_key = words[slot] ^ old_data
+        if old_key != key:
+            # Depth-preferred slot: keep deeper results from the current search.
+            data = words[base + 1]
+            if (
+                not data
+                or words[base] ^ data == key
+                or (data >> 50) & 0xFF != self.generation
+                or depth >= (data >> 40) & 0xFF
+            ):
+                slot, old_data, old_key = base, data, words[base] ^ data
+
+        move_code = encode_move(move) if move is not None else NULL_MOVE_CODE
+        if old_data and old_key == key and move is None:
+            move_code = old_data & 0xFFFF
+        elif old_data and old_key != key:
+            stats.collisions += 1
+
+        data = _pack(move_code, score, depth, bound, self.generation)
+        words[slot + 1] = data
+        words[slot] = (key ^ data) & _MASK_64
+
+    def hashfull(self) -> int:
+        """Permille of the first 1000 entries written during the current search."""
+        words = self._words
+        sample = min(1000, self.buckets * 2)
+        used = 0
+        for entry in range(sample):
+            data = words[entry * ENTRY_WORDS + 1]
+            if data and (data >> 50) & 0xFF == self.generation:
+                used += 1
+        return used * 1000 // sample
@@ -0,0 +1,289 @@
+"""UCI front-end for the copilot engine.
+
+Run ``python -m engine.uci`` from ``chess-game/`` (or the ``copilot-uci``
+wrapper) and talk UCI on stdin/stdout, e.g. from python-chess::
+
+    chess.engine.SimpleEngine.popen_uci(["python", "-m", "engine.uci"], cwd="chess-game")
+
+Supported: ``uci``, ``isready``, ``ucinewgame``, ``setoption`` (Hash, Threads,
+OwnBook), ``position``, ``go`` (depth, nodes, movetime, wtime/btime/winc/binc/
+movestogo, infinite, ponder), ``ponderhit``, ``stop`` and ``quit``. Searches run
+on a background thread so ``stop`` and ``ponderhit`` are handled mid-search.
+"""
+
+import sys
+import threading
+from typing import TYPE_CHECKING, List, Optional, TextIO, Union
+
+import chess
+
+from .book import book_move
+from .config import load_config
+from .search import MATE_BOUND, MATE_SCORE, SearchLimits, SearchResult, Searcher
+from .tt import TranspositionTable
+
+if TYPE_CHECKING:  # pragma: no cover - static analysis only
+    from .parallel import ParallelSearcher
+
+
+ENGINE_NAME = "Streamlit Chess Copilot"
+ENGINE_AUTHOR = "web-prototypes"
+
+MAX_HASH_MB = 4096
+MAX_THREADS = 64
+# Kept back from every clock-based budget for I/O and GUI lag.
+MOVE_OVERHEAD_MS = 30
+# Assumed moves left when the GUI does not send ``movestogo``.
+DEFAULT_MOVES_TO_GO = 30
+
+
+def format_score(score: int) -> str:
+    if abs(score) >= MATE_BOUND:
+        plies = MATE_SCORE - abs(score)
+        moves = (plies + 1) // 2
+        return f"mate {moves if score > 0 else -moves}"
+    return f"cp {score}"
+
+
+def clock_budget_ms(time_left: int, increment: int, moves_to_go: Optional[int]) -> int:
+    budget = time_left // (moves_to_go or DEFAULT_MOVES_TO_GO) + increment * 3 // 4
+    return max(10, min(budget, time_left // 2) - MOVE_OVERHEAD_MS)
+
+
+class UciEngine:
+    def __init__(self, output: TextIO = sys.stdout):
+        config = load_config()
+        self._output = output
+        self._output_lock = threading.Lock()
+        self.hash_mb = config.hash_mb
+        self.threads = config.threads
+        self.own_book = False
+        self.book_path = config.book_path
+        self.bitbase_dir = config.bitbase_dir
+        self.board = chess.Board()
+        self._searcher: Optional[Searcher] = None
+        self._parallel = None
+        self._thread: Optional[threading.Thread] = None
+        # Stop token of the running search; set by stop, ponderhit and the ponder timer.
+        self._stop_token: Optional[threading.Event] = None
+        self._ponder_limits: Optional[SearchLimits] = None
+        self._ponder_timer: Optional[threading.Timer] = None
+        self._pondering = False
+        # Set once ``bestmove`` may be sent: never before stop/ponderhit while
+        # pondering or in an infinite search, even if the search ends early.
+        self._release = threading.Event()
+
+    # -- output ----------------------------------------------------------------
+
+    def send(self, line: str):
+        with self._output_lock:
+            self._output.write(line + "\n")
+            self._output.flush()
+
+    def _info(self, result: SearchResult):
+        nps = result.nodes * 1000 // result.time_ms if result.time_ms else 0
+        pv = " ".join(move.uci() for move in result.pv)
+        self.send(
+            f"info depth {result.depth} score {format_score(result.score)} nodes {result.nodes} "
+            f"nps {nps} time {result.time_ms} pv {pv}"
+        )
+
+    # -- engine construction -----------------------------------------------------
+
+    def _searcher_for_search(self) -> Union[Searcher, "ParallelSearcher"]:
+        if self.threads > 1:
+            if self._parallel is None:
+                from .parallel import ParallelSearcher
+
+                self._parallel = ParallelSearcher(self.threads, self.hash_mb * 1024 * 1024, self.bitbase_dir)
+            return self._parallel
+        if self._searcher is None:
+            from .bitbase import Bitbases
+
+            self._searcher = Searcher(
+                TranspositionTable(self.hash_mb * 1024 * 1024),
+                bitbases=Bitbases(self.bitbase_dir) if self.bitbase_dir else None,
+                on_iteration=self._info,
+            )
+        return self._searcher
+
+    def _reset_searchers(self):
+        self._searcher = None
+        if self._parallel is not None:
+            self._parallel.close()
+            self._parallel = None
+
+    # -- commands ----------------------------------------------------------------
+
+    def handle(self, line: str) -> bool:
+        """Process one command; returns False on ``quit``."""
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send(f"option name Hash type spin default {self.hash_mb} min 1 max {MAX_HASH_MB}")
+            self.send(f"option name Threads type spin default {self.threads} min 1 max {MAX_THREADS}")
+            self.send("option name Ponder type check default false")
+            self.send("option name OwnBook type check default false")
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "setoption":
+            self._wait()
+            self._setoption(args)
+        elif command == "ucinewgame":
+            self._wait()
+            if self._searcher is not None:
+                self._searcher.table.clear()
+                self._searcher.orderer.clear()
+            if self._parallel is not None:
+                self._parallel.table.clear()
+        elif command == "position":
+            self._wait()
+            self._position(args)
+        elif command == "go":
+            self._wait()
+            self._go(args)
+        elif command == "ponderhit":
+            self._ponderhit()
+        elif command == "stop":
+            self._stop()
+            self._wait()
+        elif command == "quit":
+            self._stop()
+            self._wait()
+            self._reset_searchers()
+            return False
+        return True
+
+    def _setoption(self, args: List[str]):
+        if "name" not in args:
+            return
+        value_at = args.index("value") if "value" in args else len(args)
+        name = " ".join(args[args.index("name") + 1:value_at]).lower()
+        value = " ".join(args[value_at + 1:])
+        if name == "hash" and value.isdigit():
+            self.hash_mb = max(1, min(int(value), MAX_HASH_MB))
+            self._reset_searchers()
+        elif name == "threads" and value.isdigit():
+            self.threads = max(1, min(int(value), MAX_THREADS))
+            self._reset_searchers()
+        elif name == "ownbook":
+            self.own_book = value.lower() == "true"
+
+    def _position(self, args: List[str]):
+        moves_at = args.index("moves") if "moves" in args else len(args)
+        try:
+            if args and args[0] == "startpos":
+                board = chess.Board()
+            elif args and args[0] == "fen":
+                board = chess.Board(" ".join(args[1:moves_at]))
+            else:
+                return
+            for uci in args[moves_at + 1:]:
+                board.push_uci(uci)
+        except ValueError as exc:
+            # Keep the previous position; a GUI bug must not end the session.
+            self.send(f"info string invalid position: {exc}")
+            return
+        self.board = board
+
+    def _go(self, args: List[str]):
+        params = {}
+        flags = set()
+        index = 0
+        while index < len(args):
+            token = args[index]
+            if token in ("infinite", "ponder"):
+                flags.add(token)
+                index += 1
+            elif index + 1 < len(args) and args[index + 1].lstrip("-").isdigit():
+                params[token] = int(args[index + 1])
+                index += 2
+            else:
+                index += 1
+
+        movetime = params.get("movetime")
+        if movetime is None and ("wtime" in params or "btime" in params):
+            side = "w" if self.board.turn == chess.WHITE else "b"
+            movetime = clock_budget_ms(
+                params.get(f"{side}time", 0), params.get(f"{side}inc", 0), params.get("movestogo")
+            )
+        limits = SearchLimits(depth=params.get("depth"), nodes=params.get("nodes"), movetime_ms=movetime)
+
+        if self.own_book and self.book_path and not flags:
+            move = book_move(self.board, self.book_path)
+            if move is not None:
+                self.send(f"bestmove {move.uci()}")
+                return
+
+        self._pondering = "ponder" in flags
+        self._release.clear()
+        if self._pondering or "infinite" in flags:
+            # Search until stop; on ponderhit the real budget starts counting.
+            self._ponder_limits = limits if self._pondering else None
+            limits = SearchLimits(depth=limits.depth, nodes=limits.nodes)
+        else:
+            self._release.set()
+
+        searcher = self._searcher_for_search()
+        self._stop_token = threading.Event()
+        board = self.board.copy()
+        self._thread = threading.Thread(
+            target=self._run, args=(searcher, board, limits, self._stop_token), daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, searcher, board: chess.Board, limits: SearchLimits, stop_token: threading.Event):
+        result = searcher.search(board, limits, stop_token)
+        if not isinstance(searcher, Searcher):
+            self._info(result)
+        self._release.wait()
+        if self._ponder_timer is not None:
+            self._ponder_timer.cancel()
+            self._ponder_timer = None
+        if result.move is None:
+            self.send("bestmove 0000")
+        elif len(result.pv) > 1:
+            self.send(f"bestmove {result.move.uci()} ponder {result.pv[1].uci()}")
+        else:
+            self.send(f"bestmove {result.move.uci()}")
+
+    def _ponderhit(self):
+        if not self._pondering or self._stop_token is None:
+            return
+        self._pondering = False
+        self._release.set()
+        limits = self._ponder_limits
+        if limits is not None and limits.movetime_ms:
+            self._ponder_timer = threading.Timer(limits.movetime_ms / 1000, self._stop_token.set)
+            self._ponder_timer.daemon = True
+            self._ponder_timer.start()
+        elif limits is None or (limits.depth is None and limits.nodes is None):
+            self._stop_token.set()
+
+    def _stop(self):
+        self._release.set()
+        if self._stop_token is not None:
+            self._stop_token.set()
+
+    def _wait(self):
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self._stop_token = None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    engine = UciEngine()
+    for line in sys.stdin:
+        if not engine.handle(line.strip()):
+            break
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,360 @@
+"""Append-only binary archive of finished games.
+
+An archive is a directory of three files:
+
+``games.idx``
+    A 16-byte header, then one fixed-width 128-byte record per game: where its
+    moves and extra tags live, ply count, result, date, Elos and the first 30
+    bytes of the White, Black and Event names. Game ``i`` is at a known offset,
+    so any game is read without touching the others.
+``games.moves``
+    An 8-byte header, then every game's moves back to back as 16-bit codes
+    (from | to << 6 | promotion << 12, the engine's encoding).
+``games.tags``
+    The remaining PGN tags of each game (``FEN``, ``Site``, full names, ...)
+    as UTF-8 ``Name "value"`` lines, escaped as in PGN.
+
+Moves and tags are written before the index record that points at them, so a
+crash leaves at most unreferenced bytes behind. Readers memory-map the files
+and remap when the archive has grown. One process should write a directory at
+a time.
+
+Import and export stream one game at a time. python-chess neither escapes
+tag values when writing PGN nor unescapes them when reading, so this module
+does both: backslashes and double quotes get a backslash in front, and line
+breaks become spaces. Games that fail to parse are skipped and counted.
+
+    python game_archive.py import games.pgn archive/
+    python game_archive.py export archive/ out.pgn
+"""
+
+import argparse
+import io
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, TextIO, Tuple
+
+import chess
+import chess.pgn
+
+from engine.moves import decode_move, encode_move
+
+
+INDEX_MAGIC = b"CHIDX\x00\x00\x01"
+MOVES_MAGIC = b"CHMOV\x00\x00\x01"
+INDEX_HEADER = struct.Struct("<8s8x")
+MOVES_HEADER_BYTES = 8
+
+NAME_BYTES = 30
+# moves offset, ply count, tags offset, tags length, date, white elo, black elo,
+# result, flags, white, black, event, reserved.
+RECORD = struct.Struct(f"<QIQIIHHBB{NAME_BYTES}s{NAME_BYTES}s{NAME_BYTES}s4x")
+
+RESULTS = ("*", "1-0", "0-1", "1/2-1/2")
+FLAG_CUSTOM_START = 1
+
+# Tags stored in the fixed-width record rather than the tag blob.
+_INDEXED_TAGS = {"White", "Black", "Event", "Date", "Result", "WhiteElo", "BlackElo"}
+_TAG_LINE = re.compile(r'^(\w+) "(.*)"$')
+_TAG_ESCAPE = re.compile(r"\\(.)")
+
+
+class GameHeader(NamedTuple):
+    white: str
+    black: str
+    event: str
+    date: str
+    result: str
+    white_elo: Optional[int]
+    black_elo: Optional[int]
+    ply_count: int
+    custom_start: bool
+
+
+def _escape_tag(value: str) -> str:
+    """A tag value as it goes between the quotes of a PGN tag pair."""
+    value = value.replace("\\", "\\\\").replace('"', '\\"')
+    return value.replace("\r\n", " ").replace("\n", " ").replace("\r", " ")
+
+
+def _unescape_tag(value: str) -> str:
+    return _TAG_ESCAPE.sub(r"\1", value)
+
+
+def _fixed(text: str) -> bytes:
+    return text.encode("utf-8")[:NAME_BYTES]
+
+
+def _unfixed(raw: bytes) -> str:
+    return raw.rstrip(b"\x00").decode("utf-8", "ignore")
+
+
+def _pack_date(date: str) -> int:
+    parts = (date or "").split(".")
+    values = []
+    for part, width in zip(parts + ["", "", ""], (4, 2, 2)):
+        values.append(int(part) if part.isdigit() and len(part) == width else 0)
+    return values[0] * 10_000 + values[1] * 100 + values[2]
+
+
+def _unpack_date(value: int) -> str:
+    year, month, day = value // 10_000, value // 100 % 100, value % 100
+    return ".".join(
+        f"{part:0{width}d}" if part else "?" * width for part, width in ((year, 4), (month, 2), (day, 2))
+    )
+
+
+def _pack_elo(value: Optional[str]) -> int:
+    return min(int(value), 0xFFFF) if value and value.isdigit() else 0
+
+
+def _fits_record(name: str, value: str) -> bool:
+    """Whether an indexed tag survives the fixed-width record unchanged."""
+    if name == "Date":
+        return _unpack_date(_pack_date(value)) == value
+    if name in ("WhiteElo", "BlackElo"):
+        return str(_pack_elo(value) or "") == value
+    if name == "Result":
+        return value in RESULTS
+    return len(value.encode("utf-8")) <= NAME_BYTES
+
+
+# -----------------------------------------------------------------------------
+# Archive
+# -----------------------------------------------------------------------------
+
+class GameArchive:
+    """Games stored as 16-bit moves plus a fixed-width, memory-mapped index."""
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._index_path = os.path.join(directory, "games.idx")
+        self._moves_path = os.path.join(directory, "games.moves")
+        self._tags_path = os.path.join(directory, "games.tags")
+        self._lock = threading.Lock()
+        self._init_file(self._index_path, INDEX_HEADER.pack(INDEX_MAGIC), INDEX_MAGIC)
+        self._init_file(self._moves_path, MOVES_MAGIC, MOVES_MAGIC)
+        self._init_file(self._tags_path, b"", b"")
+        self._maps: Dict[str, mmap.mmap] = {}
+        self._mapped_count = 0
+
+    @staticmethod
+    def _init_file(path: str, header: bytes, magic: bytes):
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, "wb") as handle:
+                handle.write(header)
+            return
+        with open(path, "rb") as handle:
+            if handle.read(len(magic)) != magic:
+                raise RuntimeError(f"{path!r} is not a game archive file (bad header).")
+
+    def __len__(self) -> int:
+        return (os.path.getsize(self._index_path) - INDEX_HEADER.size) // RECORD.size
+
+    # -- writing ---------------------------------------------------------------
+
+    def append(self, moves: Sequence[chess.Move], headers: Mapping[str, str]) -> int:
+        """Store one game and return its index."""
+        codes = struct.pack(f"<{len(moves)}H", *(encode_move(move) for move in moves))
+        extra = "".join(
+            f'{name} "{_escape_tag(value)}"\n'
+            for name, value in headers.items()
+            if name not in _INDEXED_TAGS or not _fits_record(name, value)
+        ).encode("utf-8")
+        result = headers.get("Result", "*")
+
+        with self._lock:
+            moves_offset = (os.path.getsize(self._moves_path) - MOVES_HEADER_BYTES) // 2
+            tags_offset = os.path.getsize(self._tags_path)
+            with open(self._moves_path, "ab") as handle:
+                handle.write(codes)
+            with open(self._tags_path, "ab") as handle:
+                handle.write(extra)
+            record = RECORD.pack(
+                moves_offset,
+                len(moves),
+                tags_offset,
+                len(extra),
+                _pack_date(headers.get("Date", "")),
+                _pack_elo(headers.get("WhiteElo")),
+                _pack_elo(headers.get("BlackElo")),
+                RESULTS.index(result) if result in RESULTS else 0,
+                FLAG_CUSTOM_START if "FEN" in headers else 0,
+                _fixed(headers.get("White", "?")),
+                _fixed(headers.get("Black", "?")),
+                _fixed(headers.get("Event", "?")),
+            )
+            with open(self._index_path, "ab") as handle:
+                index = (handle.tell() - INDEX_HEADER.size) // RECORD.size
+                handle.write(record)
+        return index
+
+    def append_game(self, game: chess.pgn.Game) -> int:
+        return self.append(list(game.mainline_moves()), dict(game.headers))
+
+    # -- reading ---------------------------------------------------------------
+
+    def _map(self, index: int) -> Dict[str, mmap.mmap]:
+        """Maps covering game ``index``, remapped if the archive has grown."""
+        with self._lock:
+            if index < 0 or index >= self._mapped_count:
+                count = len(self)
+                if not 0 <= index < count:
+                    raise IndexError(f"game {index} out of range (archive holds {count}).")
+                # Old maps are left to the garbage collector: other threads may still be reading them.
+                maps = {}
+                for path in (self._index_path, self._moves_path, self._tags_path):
+                    if os.path.getsize(path):
+                        with open(path, "rb") as handle:
+                            maps[path] = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                self._maps, self._mapped_count = maps, count
+            return self._maps
+
+    def _record(self, index: int) -> tuple:
+        if index < 0:
+            index += len(self)
+        maps = self._map(index)
+        return maps, RECORD.unpack_from(maps[self._index_path], INDEX_HEADER.size + index * RECORD.size)
+
+    def header(self, index: int) -> GameHeader:
+        _, record = self._record(index)
+        _, plies, _, _, date, white_elo, black_elo, result, flags, white, black, event = record
+        return GameHeader(
+            white=_unfixed(white),
+            black=_unfixed(black),
+            event=_unfixed(event),
+            date=_unpack_date(date),
+            result=RESULTS[result],
+            white_elo=white_elo or None,
+            black_elo=black_elo or None,
+            ply_count=plies,
+            custom_start=bool(flags & FLAG_CUSTOM_START),
+        )
+
+    def move_codes(self, index: int) -> Sequence[int]:
+        """The game's raw 16-bit move codes."""
+        maps, record = self._record(index)
+        offset, plies = record[:2]
+        if not plies:
+            return ()
+        return struct.unpack_from(f"<{plies}H", maps[self._moves_path], MOVES_HEADER_BYTES + offset * 2)
+
+    def moves(self, index: int) -> List[chess.Move]:
+        return [decode_move(code) for code in self.move_codes(index)]
+
+    def tags(self, index: int) -> Dict[str, str]:
+        """Every PGN tag of the game, indexed and extra."""
+        maps, record = self._record(index)
+        header = self.header(index)
+        tags = {
+            "Event": header.event,
+            "Date": header.date,
+            "White": header.white,
+            "Black": header.black,
+            "Result": header.result,
+        }
+        if header.white_elo:
+            tags["WhiteElo"] = str(header.white_elo)
+        if header.black_elo:
+            tags["BlackElo"] = str(header.black_elo)
+        tags_offset, tags_length = record[2], record[3]
+        if tags_length:
+            blob = maps[self._tags_path][tags_offset:tags_offset + tags_length].decode("utf-8")
+            for line in blob.splitlines():
+                match = _TAG_LINE.match(line)
+                if match:
+                    tags[match.group(1)] = _unescape_tag(match.group(2))
+        return tags
+
+    def game(self, index: int) -> chess.pgn.Game:
+        game = chess.pgn.Game()
+        for name, value in self.tags(index).items():
+            game.headers[name] = value
+        node = game
+        for move in self.moves(index):
+            node = node.add_variation(move)
+        return game
+
+    def close(self):
+        with self._lock:
+            for mapped in self._maps.values():
+                mapped.close()
+            self._maps, self._mapped_count = {}, 0
+
+
+# -----------------------------------------------------------------------------
+# Streaming PGN import/export
+# -----------------------------------------------------------------------------
+
+class _PgnExporter(chess.pgn.StringExporter):
+    """``str(game)`` with tag values escaped."""
+
+    def visit_header(self, tagname: str, tagvalue: str) -> None:
+        super().visit_header(tagname, _escape_tag(tagvalue))
+
+
+def read_pgn_games(handle: TextIO) -> Iterator[chess.pgn.Game]:
+    """Yield games one at a time, tag values unescaped; comments and variations are dropped."""
+    while True:
+        game = chess.pgn.read_game(handle)
+        if game is None:
+            return
+        for name, value in game.headers.items():
+            game.headers[name] = _unescape_tag(value)
+        yield game
+
+
+def import_pgn(archive: GameArchive, handle: TextIO) -> Tuple[int, int]:
+    """Append every game that parsed cleanly; returns ``(imported, skipped)``."""
+    imported = skipped = 0
+    for game in read_pgn_games(handle):
+        if game.errors:
+            skipped += 1
+            continue
+        archive.append_game(game)
+        imported += 1
+    return imported, skipped
+
+
+def export_pgn(archive: GameArchive, handle: TextIO, indices: Optional[Iterable[int]] = None) -> int:
+    exported = 0
+    for index in indices if indices is not None else range(len(archive)):
+        print(archive.game(index).accept(_PgnExporter(columns=None)), file=handle, end="\n\n")
+        exported += 1
+    return exported
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import and export the binary game archive.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    importer = commands.add_parser("import", help="Append the games of a PGN file to an archive.")
+    importer.add_argument("pgn")
+    importer.add_argument("archive")
+    exporter = commands.add_parser("export", help="Write an archive out as PGN.")
+    exporter.add_argument("archive")
+    exporter.add_argument("pgn", nargs="?", help="Output file (default: stdout).")
+    args = parser.parse_args(argv)
+
+    archive = GameArchive(args.archive)
+    if args.command == "import":
+        with open(args.pgn, encoding="utf-8", errors="replace") as handle:
+            count, skipped = import_pgn(archive, handle)
+        print(f"Imported {count} games; the archive now holds {len(archive)}.", file=sys.stderr)
+        if skipped:
+            print(f"Skipped {skipped} games that did not parse.", file=sys.stderr)
+    else:
+        handle = open(args.pgn, "w", encoding="utf-8") if args.pgn else io.TextIOWrapper(sys.stdout.buffer, "utf-8")
+        with handle:
+            count = export_pgn(archive, handle)
+        print(f"Exported {count} games.", file=sys.stderr)
+    archive.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import chess
+import chess.polyglot
+
+from move_index import move_index
+
+
+GAME_STATE_CACHE_SIZE = 4096
+
+# Automatic (unclaimed) draw thresholds, as in python-chess.
+SEVENTYFIVE_MOVE_PLIES = 150
+FIVEFOLD = 5
+
+
+@dataclass(frozen=True)
+class GameState:
+    outcome: Optional[chess.Outcome]
+    check_square: Optional[chess.Square]
+
+    @property
+    def is_game_over(self) -> bool:
+        return self.outcome is not None
+
+
+class RepetitionCounter:
+    """How often each position has occurred in the game, updated one move at a time.
+
+    ``push`` after every ``board.push`` keeps it in step with the game. If the
+    board was changed behind its back (a new game, an old session) the counter
+    rebuilds itself by replaying the move stack once.
+    """
+
+    def __init__(self, board: Optional[chess.Board] = None):
+        self.keys: List[int] = []
+        self.counts: Dict[int, int] = {}
+        if board is not None:
+            self.rebuild(board)
+
+    def _add(self, key: int):
+        self.keys.append(key)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def rebuild(self, board: chess.Board):
+        self.keys, self.counts = [], {}
+        replay = board.root()
+        self._add(chess.polyglot.zobrist_hash(replay))
+        for move in board.move_stack:
+            replay.push(move)
+            self._add(chess.polyglot.zobrist_hash(replay))
+
+    def push(self, board: chess.Board):
+        if len(self.keys) != len(board.move_stack):
+            self.rebuild(board)
+            return
+        self._add(chess.polyglot.zobrist_hash(board))
+
+    def current(self, board: chess.Board) -> Tuple[int, int]:
+        """Zobrist key of ``board`` and how many times it has occurred."""
+        key = chess.polyglot.zobrist_hash(board)
+        if len(self.keys) != len(board.move_stack) + 1 or self.keys[-1] != key:
+            self.rebuild(board)
+        return key, self.counts[key]
+
+
+def _compute(board: chess.Board, key: int, repetitions: int) -> GameState:
+    # Same precedence the status panel has always shown.
+    check_square = board.king(board.turn) if board.is_check() else None
+    outcome = None
+    if not move_index(board, key).moves:
+        if check_square is not None:
+            outcome = chess.Outcome(chess.Termination.CHECKMATE, not board.turn)
+        else:
+            outcome = chess.Outcome(chess.Termination.STALEMATE, None)
+    elif board.is_insufficient_material():
+        outcome = chess.Outcome(chess.Termination.INSUFFICIENT_MATERIAL, None)
+    elif board.halfmove_clock >= SEVENTYFIVE_MOVE_PLIES:
+        outcome = chess.Outcome(chess.Termination.SEVENTYFIVE_MOVES, None)
+    elif repetitions >= FIVEFOLD:
+        outcome = chess.Outcome(chess.Termination.FIVEFOLD_REPETITION, None)
+    return GameState(outcome, check_square)
+
+
+# -----------------------------------------------------------------------------
+# Process-wide cache keyed on the position and its draw-rule state
+# -----------------------------------------------------------------------------
+
+_cache: "OrderedDict[Tuple[int, bool, bool], GameState]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def game_state(board: chess.Board, repetitions: RepetitionCounter) -> GameState:
+    key, count = repetitions.current(board)
+    # Only the two thresholds matter, not the exact clock or count.
+    cache_key = (key, board.halfmove_clock >= SEVENTYFIVE_MOVE_PLIES, count >= FIVEFOLD)
+    with _cache_lock:
+        state = _cache.get(cache_key)
+        if state is not None:
+            _cache.move_to_end(cache_key)
+            return state
+
+    state = _compute(board, key, count)
+    with _cache_lock:
+        _cache[cache_key] = state
+        if len(_cache) > GAME_STATE_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return state
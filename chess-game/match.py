@@ -0,0 +1,425 @@
+"""Self-play matches between two UCI engine builds, with an SPRT stopping rule.
+
+    python match.py ./copilot-uci /tmp/base/chess-game/copilot-uci --movetime 100 --games 400
+    python match.py ./copilot-uci ./copilot-uci --option-b Hash=64 --nodes 20000
+
+Each engine is a UCI command (``copilot-uci`` from two checkouts, or any other
+UCI engine). Every opening is played twice with colours swapped, and games run
+in parallel across a process pool that keeps one pair of engines open per
+worker. After every game a sequential probability ratio test decides between
+"B is no better than ``--elo0``" and "B is at least ``--elo1`` stronger than
+A"; the match stops as soon as either is accepted, or when ``--games`` have
+been played.
+
+The report is JSON: wins/draws/losses for B, an Elo estimate with a 95%
+interval, the SPRT state, and per-engine NPS and per-move latency percentiles.
+"""
+
+import argparse
+import io
+import json
+import math
+import multiprocessing
+import multiprocessing.util
+import os
+import shlex
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import chess
+import chess.engine
+import chess.pgn
+
+from game_archive import read_pgn_games
+from move_stats import PERCENTILES, percentile
+
+
+# Balanced openings (SAN), used when no ``--openings`` file is given.
+DEFAULT_OPENINGS = [
+    "e4 e5 Nf3 Nc6 Bb5 a6",
+    "e4 e5 Nf3 Nc6 Bc4 Bc5",
+    "e4 c5 Nf3 d6 d4 cxd4 Nxd4 Nf6 Nc3",
+    "e4 c5 Nc3 Nc6 g3",
+    "e4 e6 d4 d5 Nc3 Nf6",
+    "e4 c6 d4 d5 e5 Bf5",
+    "d4 d5 c4 e6 Nc3 Nf6",
+    "d4 d5 c4 c6 Nf3 Nf6",
+    "d4 Nf6 c4 g6 Nc3 Bg7 e4 d6",
+    "d4 Nf6 c4 e6 Nc3 Bb4",
+    "c4 e5 Nc3 Nf6 g3",
+    "Nf3 d5 g3 Nf6 Bg2 c6",
+]
+
+# Games still running after this many plies are scored as draws.
+MAX_PLIES = 400
+ENGINES = ("A", "B")
+
+
+# -----------------------------------------------------------------------------
+# Statistics
+# -----------------------------------------------------------------------------
+
+def _expected_score(elo: float) -> float:
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def _elo(score: float) -> float:
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+def _score_moments(wins: int, draws: int, losses: int) -> Tuple[float, float]:
+    """Mean score per game and its per-game variance."""
+    games = wins + draws + losses
+    mean = (wins + draws / 2) / games
+    variance = (wins * (1 - mean) ** 2 + draws * (0.5 - mean) ** 2 + losses * mean ** 2) / games
+    return mean, variance
+
+
+def elo_estimate(wins: int, draws: int, losses: int) -> Dict:
+    """Elo difference with a 95% interval, from the normal approximation."""
+    games = wins + draws + losses
+    if not games:
+        return {"elo": 0.0, "low": None, "high": None}
+    mean, variance = _score_moments(wins, draws, losses)
+    margin = 1.96 * math.sqrt(variance / games)
+    return {
+        "elo": round(_elo(mean), 1),
+        "low": round(_elo(mean - margin), 1),
+        "high": round(_elo(mean + margin), 1),
+    }
+
+
+def sprt_llr(wins: int, draws: int, losses: int, elo0: float, elo1: float) -> float:
+    """Log-likelihood ratio of H1 (``elo1``) over H0 (``elo0``), trinomial GSPRT approximation."""
+    games = wins + draws + losses
+    if not games:
+        return 0.0
+    mean, variance = _score_moments(wins, draws, losses)
+    if variance <= 0:
+        return 0.0
+    score0, score1 = _expected_score(elo0), _expected_score(elo1)
+    return games * (score1 - score0) * (2 * mean - score0 - score1) / (2 * variance)
+
+
+def sprt_bounds(alpha: float, beta: float) -> Tuple[float, float]:
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+
+# -----------------------------------------------------------------------------
+# Worker process side
+# -----------------------------------------------------------------------------
+
+_worker_engines: Dict[str, chess.engine.SimpleEngine] = {}
+_worker_specs: Dict[str, Tuple[List[str], Dict[str, object]]] = {}
+
+
+def _open_engine(name: str) -> chess.engine.SimpleEngine:
+    command, options = _worker_specs[name]
+    engine = chess.engine.SimpleEngine.popen_uci(command)
+    engine.configure(options)
+    _worker_engines[name] = engine
+    return engine
+
+
+def _close_engines():
+    for engine in _worker_engines.values():
+        try:
+            engine.quit()
+        except (chess.engine.EngineError, OSError):
+            pass
+    _worker_engines.clear()
+
+
+def _init_worker(specs: Dict[str, Tuple[List[str], Dict[str, object]]]):
+    _worker_specs.update(specs)
+    for name in ENGINES:
+        _open_engine(name)
+    multiprocessing.util.Finalize(None, _close_engines, exitpriority=10)
+
+
+def _play_game(game_id: int, fen: str, b_is_white: bool, limit: chess.engine.Limit) -> Dict:
+    """Play one game; the result and every per-move figure are from B's side."""
+    board = chess.Board(fen)
+    white, black = ("B", "A") if b_is_white else ("A", "B")
+    latencies: Dict[str, List[float]] = {name: [] for name in ENGINES}
+    nodes = {name: 0 for name in ENGINES}
+    search_ms = {name: 0 for name in ENGINES}
+    termination = None
+    forfeit = None
+
+    while termination is None:
+        outcome = board.outcome(claim_draw=True)
+        if outcome is not None:
+            termination = outcome.termination.name.lower()
+            break
+        if board.ply() >= MAX_PLIES:
+            termination = "max_plies"
+            break
+        name = white if board.turn == chess.WHITE else black
+        started = time.perf_counter()
+        try:
+            played = _worker_engines[name].play(board, limit, game=game_id, info=chess.engine.INFO_BASIC)
+        except chess.engine.EngineError:
+            # Crashed or answered nonsense: it loses, and gets a fresh process for the next game.
+            _worker_engines.pop(name).close()
+            _open_engine(name)
+            termination, forfeit = "forfeit", name
+            break
+        latencies[name].append((time.perf_counter() - started) * 1000)
+        nodes[name] += played.info.get("nodes", 0)
+        search_ms[name] += int(played.info.get("time", 0) * 1000)
+        if played.move is None or played.move not in board.legal_moves:
+            termination, forfeit = "illegal_move", name
+            break
+        board.push(played.move)
+
+    if forfeit is not None:
+        score = 0.0 if forfeit == "B" else 1.0
+    else:
+        outcome = board.outcome(claim_draw=True)
+        if outcome is None or outcome.winner is None:
+            score = 0.5
+        else:
+            score = 1.0 if (outcome.winner == chess.WHITE) == b_is_white else 0.0
+
+    return {
+        "game": game_id,
+        "fen": fen,
+        "white": white,
+        "score": score,
+        "termination": termination,
+        "moves": [move.uci() for move in board.move_stack],
+        "latency_ms": latencies,
+        "nodes": nodes,
+        "search_ms": search_ms,
+    }
+
+
+# -----------------------------------------------------------------------------
+# Orchestration
+# -----------------------------------------------------------------------------
+
+def load_openings(path: Optional[str]) -> List[str]:
+    """Opening FENs: end positions of a PGN file, FEN/EPD lines, or the built-in set."""
+    if path is None:
+        openings = []
+        for line in DEFAULT_OPENINGS:
+            board = chess.Board()
+            for san in line.split():
+                board.push_san(san)
+            openings.append(board.fen())
+        return openings
+    if path.endswith(".pgn"):
+        with open(path, encoding="utf-8", errors="replace") as handle:
+            return [game.end().board().fen() for game in read_pgn_games(handle)]
+    openings = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                board = chess.Board(line)
+            except ValueError:
+                board, _ = chess.Board.from_epd(line)
+            openings.append(board.fen())
+    return openings
+
+
+def parse_options(pairs: List[str]) -> Dict[str, object]:
+    options: Dict[str, object] = {}
+    for pair in pairs:
+        name, sep, value = pair.partition("=")
+        if not sep:
+            raise ValueError(f"Engine option {pair!r} is not NAME=VALUE.")
+        options[name] = int(value) if value.lstrip("-").isdigit() else value
+    return options
+
+
+def schedule(openings: List[str], games: int) -> Iterator[Tuple[int, str, bool]]:
+    """``(game id, fen, B plays white)``: each opening twice with colours swapped, cycled."""
+    for game_id in range(games):
+        yield game_id, openings[game_id // 2 % len(openings)], game_id % 2 == 1
+
+
+def _latency_summary(values: List[float]) -> Dict:
+    values = sorted(values)
+    summary = {f"p{pct}": round(percentile(values, pct), 1) for pct in PERCENTILES}
+    summary["max"] = round(values[-1], 1) if values else 0.0
+    return summary
+
+
+def run_match(
+    engines: Dict[str, Tuple[List[str], Dict[str, object]]], openings: List[str], limit: chess.engine.Limit,
+    games: int, workers: int, elo0: float, elo1: float, alpha: float, beta: float,
+    pgn: Optional[io.TextIOBase] = None, progress: bool = True,
+) -> Dict:
+    lower, upper = sprt_bounds(alpha, beta)
+    wins = draws = losses = 0
+    llr = 0.0
+    decision = None
+    latencies: Dict[str, List[float]] = {name: [] for name in ENGINES}
+    nodes = {name: 0 for name in ENGINES}
+    search_ms = {name: 0 for name in ENGINES}
+    terminations: Dict[str, int] = {}
+    started = time.perf_counter()
+
+    context = multiprocessing.get_context("spawn")
+    pool = context.Pool(workers, _init_worker, (engines,))
+    try:
+        tasks = [(game_id, fen, b_is_white, limit) for game_id, fen, b_is_white in schedule(openings, games)]
+        for record in pool.imap_unordered(_play_game_task, tasks):
+            if record["score"] == 1.0:
+                wins += 1
+            elif record["score"] == 0.0:
+                losses += 1
+            else:
+                draws += 1
+            terminations[record["termination"]] = terminations.get(record["termination"], 0) + 1
+            for name in ENGINES:
+                latencies[name].extend(record["latency_ms"][name])
+                nodes[name] += record["nodes"][name]
+                search_ms[name] += record["search_ms"][name]
+            if pgn is not None:
+                _write_pgn(pgn, record, engines)
+
+            llr = sprt_llr(wins, draws, losses, elo0, elo1)
+            if progress:
+                print(
+                    f"game {record['game'] + 1}: B {record['score']:g} ({record['termination']}) "
+                    f"+{wins} ={draws} -{losses} LLR {llr:.2f} [{lower:.2f}, {upper:.2f}]",
+                    file=sys.stderr,
+                )
+            if llr >= upper:
+                decision = "H1"
+            elif llr <= lower:
+                decision = "H0"
+            if decision is not None:
+                break
+    finally:
+        # Stopping early abandons the games still in progress; their engines exit with the workers.
+        pool.terminate()
+        pool.join()
+
+    played = wins + draws + losses
+    return {
+        "games": played,
+        "wins": wins,
+        "draws": draws,
+        "losses": losses,
+        "score": round((wins + draws / 2) / played, 4) if played else None,
+        "elo": elo_estimate(wins, draws, losses),
+        "sprt": {
+            "elo0": elo0,
+            "elo1": elo1,
+            "alpha": alpha,
+            "beta": beta,
+            "llr": round(llr, 3),
+            "lower": round(lower, 3),
+            "upper": round(upper, 3),
+            "result": decision,
+        },
+        "terminations": terminations,
+        "seconds": round(time.perf_counter() - started, 1),
+        "engines": {
+            name: {
+                "command": shlex.join(engines[name][0]),
+                "options": engines[name][1],
+                "moves": len(latencies[name]),
+                "nodes": nodes[name],
+                "nps": nodes[name] * 1000 // search_ms[name] if search_ms[name] else None,
+                "latency_ms": _latency_summary(latencies[name]),
+            }
+            for name in ENGINES
+        },
+    }
+
+
+def _play_game_task(task: Tuple[int, str, bool, chess.engine.Limit]) -> Dict:
+    return _play_game(*task)
+
+
+def _write_pgn(handle: io.TextIOBase, record: Dict, engines: Dict[str, Tuple[List[str], Dict[str, object]]]):
+    board = chess.Board(record["fen"])
+    for uci in record["moves"]:
+        board.push_uci(uci)
+    game = chess.pgn.Game.from_board(board)
+    black = "A" if record["white"] == "B" else "B"
+    game.headers["Event"] = "Self-play match"
+    game.headers["Round"] = str(record["game"] + 1)
+    game.headers["White"] = f"{record['white']}: {shlex.join(engines[record['white']][0])}"
+    game.headers["Black"] = f"{black}: {shlex.join(engines[black][0])}"
+    game.headers["Termination"] = record["termination"]
+    if record["score"] == 0.5:
+        game.headers["Result"] = "1/2-1/2"
+    else:
+        game.headers["Result"] = "1-0" if (record["score"] == 1.0) == (record["white"] == "B") else "0-1"
+    print(game, file=handle, end="\n\n")
+    handle.flush()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Play two UCI engines against each other with an SPRT stop.")
+    parser.add_argument("engine_a", help="Baseline engine command, e.g. ./copilot-uci from another checkout.")
+    parser.add_argument("engine_b", help="Candidate engine command.")
+    parser.add_argument("--option-a", action="append", default=[], metavar="NAME=VALUE", help="UCI option for A.")
+    parser.add_argument("--option-b", action="append", default=[], metavar="NAME=VALUE", help="UCI option for B.")
+    parser.add_argument("--openings", help="PGN file (end positions) or FEN/EPD lines (default: built-in set).")
+    parser.add_argument("--games", type=int, default=200, help="Game cap if SPRT has not decided.")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Games in parallel (each runs two engine processes).")
+    parser.add_argument("--movetime", type=int, default=0, help="Time per move in ms.")
+    parser.add_argument("--nodes", type=int, default=0, help="Node budget per move.")
+    parser.add_argument("--depth", type=int, default=0, help="Depth per move.")
+    parser.add_argument("--elo0", type=float, default=0.0, help="SPRT null hypothesis (B minus A).")
+    parser.add_argument("--elo1", type=float, default=10.0, help="SPRT alternative hypothesis.")
+    parser.add_argument("--alpha", type=float, default=0.05, help="SPRT false positive rate.")
+    parser.add_argument("--beta", type=float, default=0.05, help="SPRT false negative rate.")
+    parser.add_argument("--pgn", help="Append every finished game to this PGN file.")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+    parser.add_argument("--quiet", action="store_true", help="No per-game progress on stderr.")
+    args = parser.parse_args(argv)
+
+    if not (args.movetime or args.nodes or args.depth):
+        parser.error("Set at least one of --movetime, --nodes or --depth.")
+    try:
+        engines = {
+            "A": (shlex.split(args.engine_a), parse_options(args.option_a)),
+            "B": (shlex.split(args.engine_b), parse_options(args.option_b)),
+        }
+    except ValueError as exc:
+        parser.error(str(exc))
+    openings = load_openings(args.openings)
+    if not openings:
+        parser.error("No opening positions found.")
+    limit = chess.engine.Limit(
+        time=args.movetime / 1000 if args.movetime else None,
+        nodes=args.nodes or None,
+        depth=args.depth or None,
+    )
+
+    pgn = open(args.pgn, "a", encoding="utf-8") if args.pgn else None
+    try:
+        report = run_match(
+            engines, openings, limit, args.games, max(1, args.workers),
+            args.elo0, args.elo1, args.alpha, args.beta, pgn=pgn, progress=not args.quiet,
+        )
+    finally:
+        if pgn is not None:
+            pgn.close()
+    report["limit"] = {"movetime_ms": args.movetime or None, "nodes": args.nodes or None, "depth": args.depth or None}
+    report["openings"] = len(openings)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(payload + "\n")
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+from typing import List
+
+# Full move numbers (rows) shown per page of the history table.
+HISTORY_PAGE_ROWS = 20
+
+_TABLE_STYLE = """
+<style>
+  .move-history { border-collapse: collapse; width: 100%; max-width: 420px; font-family: monospace; }
+  .move-history th, .move-history td { padding: 4px 10px; border-bottom: 1px solid rgba(128, 128, 128, 0.25); }
+  .move-history th { text-align: left; }
+  .move-history td:first-child { color: #888; width: 3em; }
+</style>
+"""
+
+
+def _row_html(number: int, white: str, black: str) -> str:
+    return f"<tr><td>{number}</td><td>{white}</td><td>{black}</td></tr>"
+
+
+class MoveHistory:
+    """SAN moves of one game, rendered as numbered rows one ply at a time.
+
+    A row's HTML is built once, when its Black move arrives; only the trailing
+    half-row is formatted on each render. Pages are fixed-size slices, so a
+    rerun costs the same on move 5 as on move 150.
+    """
+
+    def __init__(self):
+        self.sans: List[str] = []
+        self._rows: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.sans)
+
+    def append(self, san: str):
+        self.sans.append(san)
+        if len(self.sans) % 2 == 0:
+            self._rows.append(_row_html(len(self._rows) + 1, self.sans[-2], san))
+
+    def row_count(self) -> int:
+        return (len(self.sans) + 1) // 2
+
+    def page_count(self) -> int:
+        return max(1, -(-self.row_count() // HISTORY_PAGE_ROWS))
+
+    def page_html(self, page: int) -> str:
+        start = page * HISTORY_PAGE_ROWS
+        rows = self._rows[start:start + HISTORY_PAGE_ROWS]
+        if len(self.sans) % 2 and len(self._rows) < start + HISTORY_PAGE_ROWS:
+            rows = rows + [_row_html(len(self._rows) + 1, self.sans[-1], "")]
+        return (
+            f"{_TABLE_STYLE}<table class='move-history'>"
+            "<thead><tr><th>Move</th><th>White</th><th>Black</th></tr></thead>"
+            f"<tbody>{''.join(rows)}</tbody></table>"
+        )
@@ -0,0 +1,90 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import chess
+import chess.polyglot
+
+
+MOVE_INDEX_CACHE_SIZE = 4096
+
+_SAN_DECORATIONS = "+#!?"
+
+
+def _normalise_san(text: str) -> str:
+    return text.rstrip(_SAN_DECORATIONS).replace("0-0-0", "O-O-O").replace("0-0", "O-O")
+
+
+class MoveIndex:
+    """Every legal move of one position, indexed for O(1) lookups.
+
+    Built from a single ``legal_moves`` pass. ``by_square`` maps from-square to
+    to-square to the moves between them (several only for promotions). SAN
+    strings need a push/pop per move, so the SAN index is built on first use.
+    """
+
+    def __init__(self, board: chess.Board):
+        self._board = board.copy(stack=False)
+        self.moves: Tuple[chess.Move, ...] = tuple(board.legal_moves)
+        self.by_square: Dict[chess.Square, Dict[chess.Square, List[chess.Move]]] = {}
+        for move in self.moves:
+            self.by_square.setdefault(move.from_square, {}).setdefault(move.to_square, []).append(move)
+        self.target_names: Dict[str, List[str]] = {
+            chess.square_name(from_square): [chess.square_name(to_square) for to_square in targets]
+            for from_square, targets in self.by_square.items()
+        }
+        self.by_uci: Dict[str, chess.Move] = {move.uci(): move for move in self.moves}
+        self._by_san: Optional[Dict[str, chess.Move]] = None
+        self._lock = threading.Lock()
+
+    def candidates(self, from_square: chess.Square, to_square: chess.Square) -> List[chess.Move]:
+        return self.by_square.get(from_square, {}).get(to_square, [])
+
+    def is_promotion(self, from_square: chess.Square, to_square: chess.Square) -> bool:
+        return any(move.promotion for move in self.candidates(from_square, to_square))
+
+    def _san_index(self) -> Dict[str, chess.Move]:
+        with self._lock:
+            if self._by_san is None:
+                self._by_san = {_normalise_san(self._board.san(move)): move for move in self.moves}
+            return self._by_san
+
+    def parse(self, text: str) -> Optional[chess.Move]:
+        """Resolve SAN (``Nf3``, ``O-O``, ``e8=Q+``) or UCI (``g1f3``) to a legal move."""
+        text = text.strip()
+        if not text:
+            return None
+        move = self.by_uci.get(text.lower()) or self._san_index().get(_normalise_san(text))
+        if move is not None:
+            return move
+        # Rare spellings (long algebraic, missing "=") go through the full parser.
+        try:
+            return self._board.parse_san(text)
+        except ValueError:
+            return None
+
+
+# -----------------------------------------------------------------------------
+# Process-wide cache keyed on the Zobrist hash
+# -----------------------------------------------------------------------------
+
+_cache: "OrderedDict[int, MoveIndex]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def move_index(board: chess.Board, key: Optional[int] = None) -> MoveIndex:
+    """Cached index for ``board``; pass ``key`` if its Zobrist hash is already known."""
+    if key is None:
+        key = chess.polyglot.zobrist_hash(board)
+    with _cache_lock:
+        index = _cache.get(key)
+        if index is not None:
+            _cache.move_to_end(key)
+            return index
+
+    index = MoveIndex(board)
+    with _cache_lock:
+        _cache[key] = index
+        if len(_cache) > MOVE_INDEX_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return index
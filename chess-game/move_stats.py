@@ -0,0 +1,118 @@
+"""Per-move copilot stats and their JSON Lines log.
+
+One :class:`MoveStats` record is built for every copilot move, shown in the
+sidebar debug panel and appended to ``CHESS_ENGINE_STATS_LOG`` when that is set
+(``-`` means stderr). Summarise a log, across sessions and replicas, with:
+
+    python move_stats.py stats.jsonl [more.jsonl ...]
+"""
+
+import argparse
+import json
+import sys
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, TextIO
+
+
+@dataclass
+class MoveStats:
+    timestamp: str
+    session: str
+    ply: int
+    move: str
+    san: str
+    source: str  # "book", "search" or "ponder" (answered from a search on the predicted reply)
+    depth: int = 0
+    score: int = 0
+    nodes: int = 0
+    nps: int = 0
+    pv: List[str] = field(default_factory=list)
+    search_ms: int = 0
+    queue_ms: float = 0.0
+    latency_ms: float = 0.0  # submitted to answered
+    tt_hit_rate: float = 0.0
+    movegen_ms: float = 0.0
+    ordering_ms: float = 0.0
+    evaluation_ms: float = 0.0
+    render_ms: Optional[float] = None
+    render_cache_hit_rate: Optional[float] = None
+
+    def to_json(self) -> str:
+        record = asdict(self)
+        for name, value in record.items():
+            if isinstance(value, float):
+                record[name] = round(value, 3)
+        return json.dumps(record)
+
+
+class StatsSink:
+    """Thread-safe JSON Lines appender shared by every session in the process."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._handle: Optional[TextIO] = None
+
+    def emit(self, stats: MoveStats):
+        line = stats.to_json() + "\n"
+        with self._lock:
+            if self._handle is None:
+                self._handle = sys.stderr if self.path == "-" else open(self.path, "a", encoding="utf-8")
+            self._handle.write(line)
+            self._handle.flush()
+
+    def close(self):
+        with self._lock:
+            if self._handle is not None and self._handle is not sys.stderr:
+                self._handle.close()
+            self._handle = None
+
+
+# -----------------------------------------------------------------------------
+# Log summary
+# -----------------------------------------------------------------------------
+
+SUMMARY_FIELDS = ("latency_ms", "queue_ms", "search_ms", "render_ms", "nps", "depth")
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def summarise(records: List[Dict]) -> Dict:
+    summary: Dict = {
+        "moves": len(records),
+        "book_moves": sum(1 for r in records if r.get("source") == "book"),
+        "ponder_hits": sum(1 for r in records if r.get("source") == "ponder"),
+    }
+    searched = [r for r in records if r.get("source") in ("search", "ponder")]
+    for name in SUMMARY_FIELDS:
+        values = sorted(r[name] for r in (records if name.endswith("_ms") else searched) if r.get(name) is not None)
+        summary[name] = {f"p{pct}": percentile(values, pct) for pct in PERCENTILES}
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Latency and throughput percentiles from copilot stats logs.")
+    parser.add_argument("logs", nargs="+", help="JSON Lines files written via CHESS_ENGINE_STATS_LOG.")
+    args = parser.parse_args(argv)
+
+    records = []
+    for path in args.logs:
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue  # a line torn by a crash
+    print(json.dumps(summarise(records), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""Compact per-session games and an on-disk store for idle ones.
+
+A :class:`CompactGame` is the whole game as its starting FEN plus one 16-bit
+code per move. The ``chess.Board``, SAN history and repetition counts are
+rebuilt from that on first use and dropped again when the session goes quiet.
+
+A process-wide :class:`SessionRegistry` watches every session's last rerun.
+After ``COMPACT_AFTER_SECONDS`` a game drops its rebuilt objects; after the
+idle timeout it is written to a :class:`SessionStore` directory and reduced to
+a stub. The next access restores it, so a tab left open overnight picks up
+where it stopped.
+"""
+
+import os
+import re
+import struct
+import threading
+import time
+from array import array
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+import chess
+
+from engine.moves import decode_move, encode_move
+from game_state import RepetitionCounter
+from move_history import MoveHistory
+
+if TYPE_CHECKING:  # pragma: no cover - static analysis only
+    from engine import Searcher
+
+
+# Idle time after which a game drops its Board, SAN history and repetition counts.
+COMPACT_AFTER_SECONDS = 60
+# How often the registry looks for idle sessions.
+SWEEP_SECONDS = 30
+# Stored games nobody came back for are deleted after this long.
+STORE_RETENTION_SECONDS = 7 * 24 * 3600
+
+GAME_MAGIC = b"CHSES\x00\x00\x01"
+# magic, start FEN length (0 for the standard start), move count.
+GAME_HEADER = struct.Struct("<8sHI")
+
+_SESSION_KEY = re.compile(r"^[0-9A-Za-z_-]+$")
+
+
+class CompactGame:
+    """One game as a start FEN plus 16-bit move codes (the engine's encoding).
+
+    ``board``, ``history`` and ``repetitions`` are derived caches: built from
+    the codes when first read, kept up to date by :meth:`push`, and released
+    by :meth:`compact`. After :meth:`evict` even the codes live on disk until
+    the game is next touched.
+    """
+
+    def __init__(self, start_fen: Optional[str] = None, codes: Iterable[int] = ()):
+        self.start_fen = start_fen  # None for the standard starting position
+        self.codes: Optional[array] = array("H", codes)
+        # Per-session searcher; its killer/history tables are only a warm start.
+        self.copilot: Optional["Searcher"] = None
+        self._board: Optional[chess.Board] = None
+        self._history: Optional[MoveHistory] = None
+        self._repetitions: Optional[RepetitionCounter] = None
+        self._store: Optional["SessionStore"] = None
+        self._key: Optional[str] = None
+        self._lock = threading.RLock()
+
+    # -- derived state ---------------------------------------------------------
+
+    def _codes(self) -> array:
+        if self.codes is None:
+            self._restore()
+        return self.codes
+
+    def load(self) -> bool:
+        """Bring an evicted game back now; False if it was lost and restarted empty."""
+        with self._lock:
+            return self.codes is not None or self._restore()
+
+    @property
+    def ply(self) -> int:
+        with self._lock:
+            return len(self._codes())
+
+    def moves(self) -> List[chess.Move]:
+        with self._lock:
+            return [decode_move(code) for code in self._codes()]
+
+    @property
+    def board(self) -> chess.Board:
+        with self._lock:
+            if self._board is None:
+                board = chess.Board(self.start_fen) if self.start_fen else chess.Board()
+                for code in self._codes():
+                    board.push(decode_move(code))
+                self._board = board
+            return self._board
+
+    @property
+    def history(self) -> MoveHistory:
+        with self._lock:
+            if self._history is None:
+                history = MoveHistory()
+                board = chess.Board(self.start_fen) if self.start_fen else chess.Board()
+                for code in self._codes():
+                    move = decode_move(code)
+                    history.append(board.san(move))
+                    board.push(move)
+                self._history = history
+                if self._board is None:
+                    self._board = board
+            return self._history
+
+    @property
+    def repetitions(self) -> RepetitionCounter:
+        with self._lock:
+            if self._repetitions is None:
+                self._repetitions = RepetitionCounter(self.board)
+            return self._repetitions
+
+    def push(self, move: chess.Move) -> str:
+        """Play ``move`` and return its SAN."""
+        with self._lock:
+            board = self.board
+            san = board.san(move)
+            board.push(move)
+            self.codes.append(encode_move(move))
+            if self._repetitions is not None:
+                self._repetitions.push(board)
+            if self._history is not None:
+                self._history.append(san)
+            return san
+
+    # -- memory ----------------------------------------------------------------
+
+    def compact(self):
+        """Drop everything that can be rebuilt from the codes."""
+        with self._lock:
+            self._board = self._history = self._repetitions = None
+            self.copilot = None
+
+    def evict(self, store: "SessionStore", key: str):
+        """Write the game to ``store`` and keep only a stub that restores itself."""
+        with self._lock:
+            if self.codes is None:
+                return
+            store.save(key, self.to_bytes())
+            self.compact()
+            self.codes = None
+            self._store, self._key = store, key
+
+    def _restore(self) -> bool:
+        data = self._store.load(self._key) if self._store is not None else None
+        restored = CompactGame.from_bytes(data) if data is not None else CompactGame()
+        self.start_fen, self.codes = restored.start_fen, restored.codes
+        if data is not None:
+            self._store.delete(self._key)
+        self._store = self._key = None
+        return data is not None
+
+    # -- serialisation -----------------------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        with self._lock:
+            fen = (self.start_fen or "").encode("ascii")
+            codes = self._codes()
+            return GAME_HEADER.pack(GAME_MAGIC, len(fen), len(codes)) + fen + codes.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CompactGame":
+        magic, fen_length, count = GAME_HEADER.unpack_from(data)
+        if magic != GAME_MAGIC:
+            raise ValueError("Not a stored chess session (bad header).")
+        offset = GAME_HEADER.size
+        fen = data[offset:offset + fen_length].decode("ascii") or None
+        codes = array("H")
+        codes.frombytes(data[offset + fen_length:offset + fen_length + 2 * count])
+        return cls(fen, codes)
+
+
+# -----------------------------------------------------------------------------
+# On-disk store
+# -----------------------------------------------------------------------------
+
+class SessionStore:
+    """One small file per evicted game, written atomically."""
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        if not _SESSION_KEY.match(key):
+            raise ValueError(f"Invalid session key {key!r}.")
+        return os.path.join(self.directory, f"{key}.game")
+
+    def save(self, key: str, data: bytes):
+        path = self._path(key)
+        partial = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(partial, "wb") as handle:
+            handle.write(data)
+        os.replace(partial, path)
+
+    def load(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as handle:
+                return handle.read()
+        except FileNotFoundError:
+            return None
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def purge(self, older_than_seconds: float) -> int:
+        """Delete stored games (and stray partial writes) not touched for a while."""
+        cutoff = time.time() - older_than_seconds
+        removed = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith((".game", ".tmp")) and entry.stat().st_mtime < cutoff:
+                try:
+                    os.remove(entry.path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+
+
+# -----------------------------------------------------------------------------
+# Idle-session sweeper
+# -----------------------------------------------------------------------------
+
+class SessionRegistry:
+    """Tracks every session's game and when it last reran; compacts and evicts idle ones.
+
+    Sessions call :meth:`touch` at the start of each rerun. A daemon thread
+    sweeps every ``SWEEP_SECONDS``. Evicted games are forgotten here, so the
+    games of closed tabs do not stay referenced by the registry.
+    """
+
+    def __init__(self, store: SessionStore, idle_seconds: int, compact_seconds: int = COMPACT_AFTER_SECONDS):
+        self.store = store
+        self.idle_seconds = idle_seconds
+        self.compact_seconds = min(compact_seconds, idle_seconds)
+        self._games: Dict[str, CompactGame] = {}
+        self._seen: Dict[str, float] = {}
+        self._compacted: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._sweeper, name="session-sweeper", daemon=True)
+        self._thread.start()
+
+    def touch(self, session_id: str, game: CompactGame):
+        with self._lock:
+            self._games[session_id] = game
+            self._seen[session_id] = time.monotonic()
+            self._compacted[session_id] = False
+
+    def sweep(self, now: Optional[float] = None) -> Dict[str, int]:
+        now = time.monotonic() if now is None else now
+        to_compact, to_evict = [], []
+        with self._lock:
+            for session_id, seen in self._seen.items():
+                idle = now - seen
+                if idle >= self.idle_seconds:
+                    to_evict.append((session_id, self._games[session_id]))
+                elif idle >= self.compact_seconds and not self._compacted[session_id]:
+                    to_compact.append(self._games[session_id])
+                    self._compacted[session_id] = True
+            for session_id, _ in to_evict:
+                del self._games[session_id], self._seen[session_id], self._compacted[session_id]
+        for game in to_compact:
+            game.compact()
+        for session_id, game in to_evict:
+            game.evict(self.store, session_id)
+        return {"compacted": len(to_compact), "evicted": len(to_evict)}
+
+    def active_sessions(self) -> int:
+        with self._lock:
+            return len(self._games)
+
+    def _sweeper(self):
+        while not self._closed.wait(SWEEP_SECONDS):
+            self.sweep()
+            self.store.purge(STORE_RETENTION_SECONDS)
+
+    def close(self):
+        self._closed.set()
@@ -0,0 +1,37 @@
+import json
+
+import chess
+import chess.pgn
+
+from analysis import analyse
+from engine.search import SearchLimits
+
+OPENINGS = ["e4 e5 Nf3 Nc6 Bb5", "e4 e5 Nf3 Nc6 Bc4", "d4 d5 c4 e6", "e4 e5 Nf3 Nc6 Bb5 a6"]
+
+
+def write_pgn(path):
+    with open(path, "w", encoding="utf-8") as handle:
+        for line in OPENINGS:
+            game = chess.pgn.Game()
+            node = game
+            for san in line.split():
+                node = node.add_variation(node.board().parse_san(san))
+            print(game, file=handle, end="\n\n")
+
+
+def read_reports(path):
+    with open(path, encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle]
+
+
+def test_bounded_cache_gives_the_same_reports(tmp_path):
+    source = tmp_path / "games.pgn"
+    write_pgn(source)
+    limits = SearchLimits(depth=1)
+    outputs = []
+    for cache_size in (0, 2, 1000):
+        output = tmp_path / f"analysis-{cache_size}.jsonl"
+        assert analyse(str(source), str(output), limits, workers=1, max_inflight=2, cache_size=cache_size) == 4
+        outputs.append(read_reports(output))
+    assert outputs[0] == outputs[1] == outputs[2]
+    assert [len(report["plies"]) for report in outputs[0]] == [5, 5, 4, 6]
@@ -0,0 +1,62 @@
+import chess
+import pytest
+
+from engine.bitbase import KNOWN_WIN, WDL_DRAW, WDL_LOSS, WDL_WIN, Bitbases, build
+from engine.search import MATE_BOUND, SearchLimits, Searcher
+
+
+@pytest.fixture(scope="module")
+def bitbases(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("bitbases")
+    build(str(directory))
+    return Bitbases(str(directory))
+
+
+# The tables only record win/draw/loss, so these check verdicts, not distances.
+@pytest.mark.parametrize("fen, expected", [
+    # KPK: king in front of its pawn on the sixth rank wins with either side to move.
+    ("2k5/8/2K5/2P5/8/8/8/8 w - - 0 1", WDL_WIN),
+    ("2k5/8/2K5/2P5/8/8/8/8 b - - 0 1", WDL_LOSS),
+    # KPK: rook pawn with the defender in the corner is a draw.
+    ("k7/8/8/8/8/8/P7/K7 w - - 0 1", WDL_DRAW),
+    # KPK: pawn on the sixth with its king behind is drawn either way (the win attempt stalemates).
+    ("4k3/8/4P3/4K3/8/8/8/8 w - - 0 1", WDL_DRAW),
+    ("4k3/8/4P3/4K3/8/8/8/8 b - - 0 1", WDL_DRAW),
+    # KPK: the lone king takes the undefended pawn.
+    ("8/8/8/8/3kP3/8/8/4K3 b - - 0 1", WDL_DRAW),
+    # KPK with colours reversed.
+    ("7K/8/8/8/8/2p5/2k5/8 b - - 0 1", WDL_WIN),
+    # KRK: a safe rook always wins.
+    ("8/8/8/4k3/8/8/8/R3K3 w - - 0 1", WDL_WIN),
+    ("8/8/8/4k3/8/8/8/R3K3 b - - 0 1", WDL_LOSS),
+    ("r3k3/8/8/8/4K3/8/8/8 b - - 0 1", WDL_WIN),
+    # KRK: the lone king takes the undefended rook.
+    ("8/8/8/8/8/8/1k6/R6K b - - 0 1", WDL_DRAW),
+    # KQK: checkmated is lost, stalemated is drawn.
+    ("k7/1Q6/1K6/8/8/8/8/8 b - - 0 1", WDL_LOSS),
+    ("k7/2Q5/1K6/8/8/8/8/8 b - - 0 1", WDL_DRAW),
+    # KQK: one queen move from stalemate, but White to move still wins.
+    ("k7/8/1K6/8/8/8/8/2Q5 w - - 0 1", WDL_WIN),
+])
+def test_known_verdicts(bitbases, fen, expected):
+    assert bitbases.probe_wdl(chess.Board(fen)) == expected
+
+
+def test_positions_outside_the_tables(bitbases):
+    assert bitbases.probe_wdl(chess.Board()) is None
+    assert bitbases.probe_wdl(chess.Board("8/8/8/4k3/8/8/8/B3K3 w - - 0 1")) is None
+
+
+def test_scores_are_known_wins_not_mates(bitbases):
+    board = chess.Board("8/8/8/4k3/8/8/8/R3K3 w - - 0 1")
+    assert KNOWN_WIN <= bitbases.probe_score(board) < MATE_BOUND
+    board.turn = chess.BLACK
+    assert -MATE_BOUND < bitbases.probe_score(board) <= -KNOWN_WIN
+
+
+def test_search_finds_the_mate_the_tables_only_call_a_win(bitbases):
+    board = chess.Board("k7/8/1K6/8/8/8/8/2Q5 w - - 0 1")
+    result = Searcher(bitbases=bitbases).search(board, SearchLimits(depth=3))
+    board.push(result.move)
+    assert board.is_checkmate()
+    assert result.score >= MATE_BOUND
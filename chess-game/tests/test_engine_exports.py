@@ -0,0 +1,8 @@
+import engine
+from engine import _EXPORTS
+
+
+def test_all_lists_every_lazy_export():
+    assert sorted(engine.__all__) == sorted(_EXPORTS)
+    for name in engine.__all__:
+        assert getattr(engine, name) is not None
@@ -0,0 +1,64 @@
+import io
+
+import chess
+import chess.pgn
+
+from game_archive import GameArchive, export_pgn, import_pgn, read_pgn_games
+
+AWKWARD = {
+    "Site": 'The "Old" Hall',
+    "Annotator": "C:\\games\\2024\\",
+    "White": 'Ann "The Rook" O\'Neil, a name far too long for the fixed index record',
+    "Round": "4\\\"5",
+}
+
+
+def sample_game() -> chess.pgn.Game:
+    game = chess.pgn.Game()
+    game.headers.update(AWKWARD)
+    game.headers["Date"] = "2024.05.17"
+    game.headers["Result"] = "1-0"
+    game.headers["WhiteElo"] = "2100"
+    node = game
+    for san in ("f4", "e5", "g4", "Qh4#"):
+        node = node.add_variation(node.board().parse_san(san))
+    return game
+
+
+def test_tags_round_trip_through_archive_and_pgn(tmp_path):
+    game = sample_game()
+    archive = GameArchive(str(tmp_path / "a"))
+    archive.append_game(game)
+    assert archive.tags(0) == dict(game.headers)
+
+    text = io.StringIO()
+    assert export_pgn(archive, text) == 1
+    assert '[Site "The \\"Old\\" Hall"]' in text.getvalue()
+    assert '[Annotator "C:\\\\games\\\\2024\\\\"]' in text.getvalue()
+
+    (reread,) = read_pgn_games(io.StringIO(text.getvalue()))
+    assert dict(reread.headers) == dict(game.headers)
+    assert list(reread.mainline_moves()) == list(game.mainline_moves())
+
+    copy = GameArchive(str(tmp_path / "b"))
+    assert import_pgn(copy, io.StringIO(text.getvalue())) == (1, 0)
+    assert copy.tags(0) == archive.tags(0)
+    assert copy.move_codes(0) == archive.move_codes(0)
+
+
+def test_line_breaks_in_tag_values_become_spaces(tmp_path):
+    archive = GameArchive(str(tmp_path))
+    archive.append([], {"Site": "first\nsecond", "Annotator": "a\r\nb"})
+    assert archive.tags(0)["Site"] == "first second"
+    assert archive.tags(0)["Annotator"] == "a b"
+
+
+def test_import_counts_games_that_do_not_parse(tmp_path):
+    pgn = (
+        '[Event "good"]\n\n1. e4 e5 *\n\n'
+        '[Event "bad"]\n\n1. e4 e4 *\n\n'
+        '[Event "also good"]\n\n1. d4 *\n\n'
+    )
+    archive = GameArchive(str(tmp_path))
+    assert import_pgn(archive, io.StringIO(pgn)) == (2, 1)
+    assert [archive.header(index).event for index in range(len(archive))] == ["good", "also good"]
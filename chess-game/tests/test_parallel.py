@@ -0,0 +1,43 @@
+import threading
+import time
+
+import chess
+import pytest
+
+from engine import ParallelSearcher, SearchLimits
+
+
+@pytest.fixture(scope="module")
+def parallel():
+    searcher = ParallelSearcher(2, 1 << 20)
+    yield searcher
+    searcher.close()
+
+
+def test_stop_token_ends_only_its_own_search(parallel):
+    stop = threading.Event()
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.append(parallel.search(chess.Board(), SearchLimits(movetime_ms=5000), stop))
+    )
+    thread.start()
+    time.sleep(0.5)
+    started = time.monotonic()
+    stop.set()
+    thread.join(3)
+    assert not thread.is_alive()
+    assert time.monotonic() - started < 1.0
+    assert results[0].move in chess.Board().legal_moves
+
+    # The pool's shared stop event was reset for the next caller.
+    result = parallel.search(chess.Board(), SearchLimits(depth=2), threading.Event())
+    assert result.depth == 2
+
+
+def test_search_stopped_while_waiting_skips_the_pool(parallel):
+    stop = threading.Event()
+    stop.set()
+    started = time.monotonic()
+    result = parallel.search(chess.Board(), SearchLimits(movetime_ms=5000), stop)
+    assert time.monotonic() - started < 0.5
+    assert result.move in chess.Board().legal_moves
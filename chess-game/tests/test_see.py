@@ -0,0 +1,34 @@
+import chess
+import pytest
+
+from engine.see import SEE_VALUES, see
+
+P, N, R, Q = (SEE_VALUES[piece] for piece in (chess.PAWN, chess.KNIGHT, chess.ROOK, chess.QUEEN))
+
+
+@pytest.mark.parametrize("fen, uci, expected", [
+    # Undefended pawn.
+    ("1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1", "e1e5", P),
+    # Knight takes a pawn that is defended twice; the queen's x-ray comes too late.
+    ("1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1", "d3e5", P - N),
+    # Queen takes a pawn-defended pawn.
+    ("4k3/8/3p4/4p3/8/8/4Q3/4K3 w - - 0 1", "e2e5", P - Q),
+    # Even knight trade.
+    ("4k3/8/3p4/4n3/8/5N2/8/4K3 w - - 0 1", "f3e5", 0),
+    # The rook behind the capturer joins by x-ray, so Black does not recapture.
+    ("4r1k1/8/8/4n3/8/8/4R3/4R1K1 w - - 0 1", "e2e5", N),
+    # En passant takes the pawn beside the target square.
+    ("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1", "e5d6", P),
+    # Capture-promotion with nothing to recapture.
+    ("3r2k1/4P3/8/8/8/8/8/4K3 w - - 0 1", "e7d8q", R + Q - P),
+    # Promoting next to the enemy king loses the pawn.
+    ("5k2/4P3/8/8/8/8/8/4K3 w - - 0 1", "e7e8q", -P),
+    # A king may recapture only when the square is not defended.
+    ("4k3/4r3/8/8/8/8/4R3/4K3 b - - 0 1", "e7e2", 0),
+    ("4r1k1/4r3/8/8/8/8/4R3/4K3 b - - 0 1", "e7e2", R),
+])
+def test_known_exchanges(fen, uci, expected):
+    board = chess.Board(fen)
+    move = chess.Move.from_uci(uci)
+    assert board.is_legal(move)
+    assert see(board, move) == expected
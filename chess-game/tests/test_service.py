@@ -0,0 +1,129 @@
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import chess
+import pytest
+
+from engine import EngineService, SearchLimits, Searcher, TranspositionTable
+
+LONG_SEARCH = SearchLimits(movetime_ms=5000)
+
+
+@pytest.fixture
+def service():
+    service = EngineService(workers=1, max_pending=4, max_ponder=1)
+    yield service
+    service.close()
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_cancel_before_search_starts_is_not_lost(service):
+    searcher = Searcher(TranspositionTable(1 << 16))
+    dequeued, go = threading.Event(), threading.Event()
+
+    def run(stop):
+        dequeued.set()
+        go.wait()
+        return searcher.search(chess.Board(), LONG_SEARCH, stop)
+
+    job = service.submit("a", run)
+    dequeued.wait(1)
+    service.cancel(job)
+    go.set()
+    started = time.monotonic()
+    with pytest.raises(CancelledError):
+        job.future.result(timeout=2)
+    assert time.monotonic() - started < 0.5
+
+
+def test_cancel_right_after_start_resolves_quickly(service):
+    searcher = Searcher(TranspositionTable(1 << 16))
+    job = service.submit("a", lambda stop: searcher.search(chess.Board(), LONG_SEARCH, stop))
+    wait_until(lambda: job.started is not None)
+    started = time.monotonic()
+    service.cancel(job)
+    with pytest.raises(CancelledError):
+        job.future.result(timeout=2)
+    assert time.monotonic() - started < 0.5
+
+
+def test_cancel_while_queued_never_runs(service):
+    go = threading.Event()
+    blocker = service.submit("a", lambda stop: go.wait())
+    wait_until(lambda: blocker.started is not None)
+    ran = []
+    job = service.submit("b", lambda stop: ran.append(True))
+    service.cancel(job)
+    go.set()
+    blocker.future.result(timeout=2)
+    assert job.future.cancelled()
+    assert not ran
+
+
+def test_owned_stop_event_still_resets_between_searches():
+    searcher = Searcher(TranspositionTable(1 << 16))
+    searcher.stop()
+    result = searcher.search(chess.Board(), SearchLimits(depth=2))
+    assert result.depth == 2
+
+
+def test_ponder_submitted_just_before_a_request_cannot_delay_it(service):
+    ponder_searcher = Searcher(TranspositionTable(1 << 16))
+    board = chess.Board()
+    for _ in range(20):
+        ponder = service.submit(
+            "a", lambda stop: ponder_searcher.search(board, LONG_SEARCH, stop), ponder=True
+        )
+        request = service.submit("b", lambda stop: "moved")
+        started = time.monotonic()
+        assert request.future.result(timeout=2) == "moved"
+        assert time.monotonic() - started < 0.5
+        # A ponder job that was still queued runs afterwards; clear it for the next round.
+        service.cancel(ponder)
+        wait_until(ponder.done)
+
+
+def test_adopted_ponder_job_is_not_preempted(service):
+    budget = 0.3
+    ponder = service.submit("a", lambda stop: stop.wait(budget), ponder=True)
+    wait_until(lambda: ponder.started is not None)
+    assert service.adopt(ponder)
+    request = service.submit("b", lambda stop: "moved")
+    assert ponder.future.result(timeout=2) is False  # never stopped
+    assert not ponder.preempted
+    assert ponder.finished - ponder.started >= budget
+    assert request.future.result(timeout=2) == "moved"
+    # No longer a ponder job, so it does not hold the ponder slot either.
+    assert service.submit("c", lambda stop: None, ponder=True).future.result(timeout=2) is None
+
+
+def test_preempted_ponder_job_cannot_be_adopted(service):
+    ponder = service.submit("a", lambda stop: stop.wait(5), ponder=True)
+    wait_until(lambda: ponder.started is not None)
+    service.submit("b", lambda stop: "moved")
+    assert ponder.preempted
+    assert not service.adopt(ponder)
+
+
+def test_resubmitting_keeps_the_session_place_in_line(service):
+    go = threading.Event()
+    blocker = service.submit("blocker", lambda stop: go.wait())
+    wait_until(lambda: blocker.started is not None)
+    order = []
+    first = service.submit("a", lambda stop: order.append("a1"))
+    service.submit("b", lambda stop: order.append("b"))
+    service.submit("c", lambda stop: order.append("c"))
+    again = service.submit("a", lambda stop: order.append("a2"))
+    assert first.future.cancelled()
+    assert service.queue_depth() == 3
+    go.set()
+    again.future.result(timeout=2)
+    wait_until(lambda: len(order) == 3)
+    assert order == ["a2", "b", "c"]
@@ -0,0 +1,89 @@
+import os
+import random
+from typing import List, Tuple
+
+import chess
+
+from session_store import CompactGame, SessionRegistry, SessionStore
+
+CUSTOM_START = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+
+def random_game(game: CompactGame, plies: int, seed: int) -> Tuple[chess.Board, List[str]]:
+    """Play random moves (promotions and castling included) on ``game`` and on a reference board."""
+    rng = random.Random(seed)
+    board = chess.Board(game.start_fen) if game.start_fen else chess.Board()
+    sans = []
+    for _ in range(plies):
+        moves = list(board.legal_moves)
+        if not moves:
+            break
+        move = rng.choice(moves)
+        sans.append(board.san(move))
+        assert game.push(move) == sans[-1]
+        board.push(move)
+    return board, sans
+
+
+def assert_same_game(game: CompactGame, board: chess.Board, sans: List[str]):
+    assert game.board.fen() == board.fen()
+    assert game.history.sans == sans
+    assert game.board.peek() == board.peek()  # the last move, highlighted on the board
+    assert game.moves() == board.move_stack
+
+
+def test_compact_evict_restore(tmp_path):
+    store = SessionStore(str(tmp_path))
+    for seed, start in enumerate((None, CUSTOM_START)):
+        game = CompactGame(start)
+        board, sans = random_game(game, 120, seed)
+        key = f"session-{seed}"
+
+        game.compact()
+        assert game._board is None and game._history is None
+        assert_same_game(game, board, sans)
+
+        game.evict(store, key)
+        assert game.codes is None
+        assert os.path.exists(os.path.join(str(tmp_path), f"{key}.game"))
+
+        assert game.load()
+        assert not os.path.exists(os.path.join(str(tmp_path), f"{key}.game"))
+        assert_same_game(game, board, sans)
+        assert game.start_fen == start
+
+        # The restored game keeps playing.
+        move = next(iter(board.legal_moves), None)
+        if move is not None:
+            sans.append(board.san(move))
+            board.push(move)
+            assert game.push(move) == sans[-1]
+            assert_same_game(game, board, sans)
+
+
+def test_lost_store_file_starts_a_new_game(tmp_path):
+    store = SessionStore(str(tmp_path))
+    game = CompactGame()
+    random_game(game, 10, 3)
+    game.evict(store, "gone")
+    store.delete("gone")
+    assert not game.load()
+    assert game.ply == 0
+    assert game.board.fen() == chess.Board().fen()
+
+
+def test_registry_compacts_then_evicts(tmp_path):
+    registry = SessionRegistry(SessionStore(str(tmp_path)), idle_seconds=100, compact_seconds=10)
+    try:
+        game = CompactGame()
+        board, sans = random_game(game, 30, 7)
+        registry.touch("tab", game)
+        start = registry._seen["tab"]
+        assert registry.sweep(start + 5) == {"compacted": 0, "evicted": 0}
+        assert registry.sweep(start + 10) == {"compacted": 1, "evicted": 0}
+        assert game._board is None
+        assert registry.sweep(start + 100) == {"compacted": 0, "evicted": 1}
+        assert game.codes is None and registry.active_sessions() == 0
+        assert_same_game(game, board, sans)
+    finally:
+        registry.close()
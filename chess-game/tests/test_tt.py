@@ -0,0 +1,94 @@
+import chess
+import pytest
+
+from engine.search import MATE_SCORE, MAX_PLY
+from engine.tt import (
+    BOUND_EXACT, BOUND_LOWER, BOUND_UPPER, BUCKET_BYTES, TTEntry, TranspositionTable, _SCORE_OFFSET,
+)
+
+KEYS = [0x9D39247E33776D41, 0x2AF7398005AAA5C7, 0x44DB015024623547, 0x9C15F73E62A76AE2]
+
+
+def one_bucket() -> TranspositionTable:
+    # Every key lands in the same two-slot bucket.
+    return TranspositionTable(BUCKET_BYTES)
+
+
+@pytest.mark.parametrize("score", [
+    -_SCORE_OFFSET + 1, -MATE_SCORE - MAX_PLY, -MATE_SCORE + 1, -1, 0, 1, MATE_SCORE - 1,
+    MATE_SCORE + MAX_PLY, _SCORE_OFFSET - 1,
+])
+@pytest.mark.parametrize("depth", [0, 1, MAX_PLY - 1, 255])
+def test_pack_round_trip_at_extremes(score, depth):
+    table = TranspositionTable(1 << 12)
+    for bound in (BOUND_EXACT, BOUND_LOWER, BOUND_UPPER):
+        for move in (chess.Move.from_uci("e2e4"), chess.Move.from_uci("h7h8q"), chess.Move.from_uci("a2a1n"), None):
+            table.clear()
+            table.store(KEYS[0], move, score, depth, bound)
+            assert table.probe(KEYS[0]) == TTEntry(move, score, depth, bound)
+
+
+def test_round_trip_after_generation_wraps():
+    table = one_bucket()
+    for _ in range(300):
+        table.new_search()
+    assert table.generation == 300 & 0xFF
+    table.store(KEYS[0], chess.Move.from_uci("g1f3"), -MATE_SCORE, 7, BOUND_LOWER)
+    assert table.probe(KEYS[0]) == TTEntry(chess.Move.from_uci("g1f3"), -MATE_SCORE, 7, BOUND_LOWER)
+
+
+def test_negative_depth_is_stored_as_zero():
+    table = one_bucket()
+    table.store(KEYS[0], None, 5, -3, BOUND_UPPER)
+    assert table.probe(KEYS[0]).depth == 0
+
+
+def test_store_without_move_keeps_the_old_move():
+    table = one_bucket()
+    move = chess.Move.from_uci("d2d4")
+    table.store(KEYS[0], move, 10, 4, BOUND_LOWER)
+    table.store(KEYS[0], None, -20, 5, BOUND_UPPER)
+    assert table.probe(KEYS[0]) == TTEntry(move, -20, 5, BOUND_UPPER)
+
+
+def test_deeper_entry_survives_within_a_search():
+    table = one_bucket()
+    table.store(KEYS[0], None, 1, 10, BOUND_EXACT)  # empty depth-preferred slot
+    table.store(KEYS[1], None, 2, 2, BOUND_EXACT)  # shallower: always-replace slot
+    table.store(KEYS[2], None, 3, 3, BOUND_EXACT)  # pushes out KEYS[1] only
+    assert table.probe(KEYS[0]).depth == 10
+    assert table.probe(KEYS[1]) is None
+    assert table.probe(KEYS[2]).depth == 3
+    assert table.stats.collisions == 1
+
+
+def test_equal_or_deeper_entry_takes_the_depth_preferred_slot():
+    table = one_bucket()
+    table.store(KEYS[0], None, 1, 6, BOUND_EXACT)
+    table.store(KEYS[1], None, 2, 6, BOUND_EXACT)
+    assert table.probe(KEYS[0]) is None
+    assert table.probe(KEYS[1]).depth == 6
+
+
+def test_old_generation_entry_is_replaced_even_if_deeper():
+    table = one_bucket()
+    table.store(KEYS[0], None, 1, 20, BOUND_EXACT)
+    table.store(KEYS[1], None, 2, 1, BOUND_EXACT)
+    table.new_search()
+    table.store(KEYS[2], None, 3, 1, BOUND_EXACT)
+    assert table.probe(KEYS[0]) is None
+    assert table.probe(KEYS[1]) is not None
+    assert table.probe(KEYS[2]).depth == 1
+    # Now current, the shallow entry keeps its slot against the next one.
+    table.store(KEYS[3], None, 4, 0, BOUND_EXACT)
+    assert table.probe(KEYS[2]) is not None
+    assert table.probe(KEYS[1]) is None
+
+
+def test_tables_over_one_buffer_share_entries():
+    buffer = bytearray(1 << 12)
+    writer, reader = TranspositionTable(1 << 12, buffer), TranspositionTable(1 << 12, buffer)
+    writer.store(KEYS[0], chess.Move.from_uci("e7e5"), 33, 3, BOUND_EXACT)
+    assert reader.probe(KEYS[0]) == TTEntry(chess.Move.from_uci("e7e5"), 33, 3, BOUND_EXACT)
+    reader.clear()
+    assert writer.probe(KEYS[0]) is None
@@ -0,0 +1,36 @@
+import io
+
+import chess
+import pytest
+
+from engine.uci import UciEngine
+
+
+@pytest.fixture
+def engine():
+    output = io.StringIO()
+    engine = UciEngine(output)
+    yield engine, output
+    engine.handle("quit")
+
+
+@pytest.mark.parametrize("command", [
+    "position fen not a fen",
+    "position fen rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x KQkq - 0 1",
+    "position startpos moves e2e4 e2e4",
+    "position startpos moves e2e4 zz99",
+    "position startpos moves e7e5",
+])
+def test_invalid_position_keeps_the_previous_board(engine, command):
+    engine, output = engine
+    assert engine.handle("position startpos moves d2d4")
+    assert engine.handle(command)
+    assert output.getvalue().startswith("info string invalid position: ")
+    assert engine.board.move_stack == [chess.Move.from_uci("d2d4")]
+
+    # Still answers afterwards, from the kept position.
+    engine.handle("go depth 1")
+    engine.handle("stop")
+    lines = output.getvalue().splitlines()
+    best = next(line for line in lines if line.startswith("bestmove"))
+    assert chess.Move.from_uci(best.split()[1]) in engine.board.legal_moves
@@ -1,9 +1,9 @@
+import csv
 import random
 import streamlit as st
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
-import pandas as pd
 
 st.set_page_config(
     page_title="Knowledge Arcade — Quiz Arena",
@@ -641,10 +641,31 @@ LEADERBOARD_PATH = Path(__file__).with_name("leaderboard.csv")
 LEADERBOARD_COLUMNS = ["timestamp", "player", "domain", "score", "total", "percent"]
 
 
-def load_leaderboard() -> pd.DataFrame:
-    if LEADERBOARD_PATH.exists():
-        return pd.read_csv(LEADERBOARD_PATH)
-    return pd.DataFrame(columns=LEADERBOARD_COLUMNS)
+# The leaderboard is a small CSV read with the standard library; pandas
+# would add a third of a second to every cold start.
+def load_leaderboard() -> List[Dict]:
+    if not LEADERBOARD_PATH.exists():
+        return []
+    with LEADERBOARD_PATH.open(newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    for row in rows:
+        row["score"] = int(row["score"])
+        row["total"] = int(row["total"])
+        row["percent"] = float(row["percent"])
+    return rows
+
+
+def top_scores(leaderboard: List[Dict], limit: int = 10) -> List[Dict]:
+    return sorted(leaderboard, key=lambda row: (row["percent"], row["timestamp"]), reverse=True)[:limit]
+
+
+def render_table(rows: List[Dict], columns: List[str]) -> None:
+    def cell(value) -> str:
+        return str(value).replace("|", "\\|").replace("$", "\\$").replace("\n", " ")
+
+    lines = ["| " + " | ".join(columns) + " |", "|" + " --- |" * len(columns)]
+    lines += ["| " + " | ".join(cell(row[column]) for column in columns) + " |" for row in rows]
+    st.markdown("\n".join(lines))
 
 
 def record_score(player: str, domain: str, score: int, total: int) -> None:
@@ -656,9 +677,12 @@ def record_score(player: str, domain: str, score: int, total: int) -> None:
         "total": total,
         "percent": round((score / total) * 100, 1),
     }
-    leaderboard = load_leaderboard()
-    leaderboard = pd.concat([leaderboard, pd.DataFrame([entry])], ignore_index=True)
-    leaderboard.to_csv(LEADERBOARD_PATH, index=False)
+    is_new = not LEADERBOARD_PATH.exists() or LEADERBOARD_PATH.stat().st_size == 0
+    with LEADERBOARD_PATH.open("a", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=LEADERBOARD_COLUMNS, lineterminator="\n")
+        if is_new:
+            writer.writeheader()
+        writer.writerow(entry)
 
 
 def inject_styles() -> None:
@@ -830,14 +854,11 @@ def landing_page() -> None:
                 )
 
     with st.expander("View global leaderboard (top 10)"):
-        if leaderboard.empty:
+        if not leaderboard:
             st.info("No entries yet. Be the first one to post a score!")
         else:
-            top = leaderboard.sort_values(
-                by=["percent", "timestamp"], ascending=[False, False]
-            ).head(10)
             display_cols = ["player", "domain", "score", "total", "percent", "timestamp"]
-            st.table(top[display_cols])
+            render_table(top_scores(leaderboard), display_cols)
 
 
 def quiz_page() -> None:
@@ -929,8 +950,7 @@ def results_page() -> None:
     st.title("Quiz Results")
     st.subheader(domain["title"])
     st.metric("Score", f"{score} / {len(questions)}")
-    df = pd.DataFrame(rows).set_index("Q#")
-    st.table(df)
+    render_table(rows, ["Q#", "Question", "Your answer", "Correct", "Correct?"])
 
     st.success("Great work! Replay to get a new random mix or log your score.")
 
@@ -962,14 +982,11 @@ def results_page() -> None:
             st.caption("Already posted ✅")
 
     with st.expander("Leaderboard highlights"):
-        if leaderboard.empty:
+        if not leaderboard:
             st.info("No leaderboard entries yet.")
         else:
-            top = leaderboard.sort_values(
-                by=["percent", "timestamp"], ascending=[False, False]
-            ).head(10)
             display_cols = ["player", "domain", "score", "total", "percent", "timestamp"]
-            st.table(top[display_cols])
+            render_table(top_scores(leaderboard), display_cols)
 
 
 def main() -> None:
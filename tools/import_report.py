@@ -0,0 +1,109 @@
+"""Import-time report for the Streamlit apps.
+
+Imports an app's ``app.py`` in a fresh interpreter with ``-X importtime``,
+prints its slowest direct imports and exits non-zero when the import takes
+longer than the budget, or when a module that should load lazily is imported
+at startup. Run from the repository root:
+
+    python tools/import_report.py chess-game --budget-ms 800 --forbid numpy pandas chess.svg multiprocessing.shared_memory
+    python tools/import_report.py question-answering-quiz --budget-ms 700 --forbid pandas
+
+Each run takes the fastest of ``--repeat`` imports to smooth out noise.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple, Optional
+
+
+class ImportRecord(NamedTuple):
+    name: str
+    level: int
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the column header
+        label = fields[2][1:]
+        name = label.lstrip()
+        level = (len(label) - len(name)) // 2
+        records.append(ImportRecord(name, level, int(fields[0]), int(fields[1])))
+    return records
+
+
+def measure(app_dir: str, module: str = "app") -> List[ImportRecord]:
+    # ``-X importtime`` lists children before their parent; the module itself
+    # is the last top-level record.
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=app_dir,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} from {app_dir!r} failed:\n{completed.stderr}")
+    return parse_importtime(completed.stderr)
+
+
+def summarise(records: List[ImportRecord], module: str = "app", top: int = 10) -> Dict:
+    root = max(i for i, record in enumerate(records) if record.level == 0 and record.name == module)
+    children = []
+    for record in reversed(records[:root]):
+        if record.level == 0:
+            break
+        if record.level == 1:
+            children.append(record)
+    children.sort(key=lambda record: record.cumulative_us, reverse=True)
+    return {
+        "total_ms": round(records[root].cumulative_us / 1000, 1),
+        "slowest": [
+            {"module": record.name, "cumulative_ms": round(record.cumulative_us / 1000, 1)}
+            for record in children[:top]
+        ],
+        "modules": sorted({record.name for record in records}),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure how long an app takes to import.")
+    parser.add_argument("app_dir", help="Directory containing app.py.")
+    parser.add_argument("--budget-ms", type=float, help="Fail if importing the app takes longer than this.")
+    parser.add_argument("--forbid", nargs="*", default=[], help="Modules that must not load at startup.")
+    parser.add_argument("--repeat", type=int, default=3, help="Imports to run; the fastest one is reported.")
+    parser.add_argument("--top", type=int, default=10, help="Direct imports to list.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args(argv)
+
+    runs = [summarise(measure(os.path.abspath(args.app_dir)), top=args.top) for _ in range(max(1, args.repeat))]
+    report = min(runs, key=lambda run: run["total_ms"])
+    loaded = set(report.pop("modules"))
+    report["forbidden_loaded"] = [name for name in args.forbid if name in loaded]
+    report["budget_ms"] = args.budget_ms
+    over_budget = args.budget_ms is not None and report["total_ms"] > args.budget_ms
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{args.app_dir}: {report['total_ms']} ms" + (f" (budget {args.budget_ms} ms)" if args.budget_ms else ""))
+        for entry in report["slowest"]:
+            print(f"  {entry['cumulative_ms']:>8.1f} ms  {entry['module']}")
+        if report["forbidden_loaded"]:
+            print("Loaded at startup but should be lazy: " + ", ".join(report["forbidden_loaded"]))
+        if over_budget:
+            print("Import time is over budget.")
+
+    return 1 if over_budget or report["forbidden_loaded"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())